@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# bench_decode.py - Compare field-selective clients -j decoding with the full json.loads path
+# Usage: ./bench_decode.py [--sizes 100,1000,5000] [--rounds 50]
+#        ./bench_decode.py --fixtures DIR       # decode a recorded clients.json (see bench_rename.py --record)
+# Checks both paths agree, then shows time per decode and the peak memory (tracemalloc)
+# allocated while decoding, which for json.loads includes every per-client dict
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+import benchlib
+from records import client_from_json, clients_from_text
+
+
+def full_decode(text: str) -> list:
+    return [client_from_json(client) for client in json.loads(text)]
+
+
+def peak_kib(decode, text: str) -> float:
+    tracemalloc.start()
+    decode(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def timed(decode, text: str, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        decode(text)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def bench_text(label: str, text: str, rounds: int) -> None:
+    assert clients_from_text(text) == full_decode(text), f"{label}: decoders disagree"
+    full_ms, selective_ms = timed(full_decode, text, rounds), timed(clients_from_text, text, rounds)
+    full_peak, selective_peak = peak_kib(full_decode, text), peak_kib(clients_from_text, text)
+    print(f"{label:>14} {len(text) / 1024:7.0f}KiB  json.loads {full_ms:6.2f}ms {full_peak:7.0f}KiB peak  "
+          f"selective {selective_ms:6.2f}ms {selective_peak:7.0f}KiB peak  ({full_ms / selective_ms:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="100,1000,5000", help="Comma separated synthetic client counts")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--fixtures", help="Decode the clients.json recorded in this directory instead")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        with open(os.path.join(args.fixtures, "clients.json")) as f:
+            bench_text(os.path.basename(args.fixtures.rstrip("/")), f.read(), args.rounds)
+        return
+    for size in map(int, args.sizes.split(",")):
+        session = benchlib.synthetic_session(size)
+        # Same layout write_fixtures records, escapes and all
+        text = json.dumps(session["clients"], indent=4, ensure_ascii=False)
+        bench_text(f"{size} clients", text, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# bench_ipc.py - Compare snapshot latency: 4x hyprctl forks vs one batched IPC request
+# Usage: ./bench_ipc.py [ROUNDS]
+# Requires a running Hyprland session (or the stand-in server)
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "hypr", "UserScripts"))
+
+import hypr_ipc  # noqa: E402
+from RenameWorkspaces import SNAPSHOT_QUERIES, run_hyprctl  # noqa: E402
+
+
+def timed(fn, rounds: int) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"{label:<24} mean={statistics.mean(samples):7.2f}ms "
+          f"p50={statistics.median(samples):7.2f}ms p95={p95:7.2f}ms")
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    if not os.path.exists(hypr_ipc.request_socket_path()):
+        print(f"Error: Hyprland socket not found at {hypr_ipc.request_socket_path()}", file=sys.stderr)
+        sys.exit(1)
+
+    subprocess_samples = timed(lambda: [run_hyprctl([q, "-j"]) for q in SNAPSHOT_QUERIES], rounds)
+    single_samples = timed(lambda: [hypr_ipc.request(f"j/{q}") for q in SNAPSHOT_QUERIES], rounds)
+    batch_samples = timed(lambda: hypr_ipc.batch([f"j/{q}" for q in SNAPSHOT_QUERIES]), rounds)
+
+    print(f"{rounds} rounds of {len(SNAPSHOT_QUERIES)} queries ({', '.join(SNAPSHOT_QUERIES)})")
+    report("hyprctl subprocess x4", subprocess_samples)
+    report("socket request x4", single_samples)
+    report("socket [[BATCH]] x1", batch_samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# bench_prefix.py - Compare the prefix trie with the original dict-of-slices longest_common_prefix
+# Usage: ./bench_prefix.py [NAMES] [ROUNDS]
+# Checks both agree on randomized add/remove sequences, then times from-scratch and incremental use
+
+import random
+from collections import Counter
+import sys
+import time
+
+import benchlib  # noqa: F401  (puts hypr/UserScripts on sys.path)
+from prefix_trie import SEPARATORS, PrefixTrie
+
+
+def dict_longest_common_prefix(names: list[str]) -> str:
+    """The original implementation, kept as the reference."""
+    if len(names) < 2:
+        return ""
+    prefix_counts: dict[str, int] = {}
+    for name in names:
+        seen: set[str] = set()
+        for i, ch in enumerate(name):
+            if ch in SEPARATORS:
+                prefix = name[: i + 1]
+                if prefix not in seen:
+                    seen.add(prefix)
+                    prefix_counts[prefix] = prefix_counts.get(prefix, 0) + 1
+    best = ""
+    for prefix, count in prefix_counts.items():
+        if count >= 2 and len(prefix) > len(best):
+            best = prefix
+    return best
+
+
+def branch_names(count: int, rng: random.Random) -> list[str]:
+    words = ["fix", "bug", "add", "retry", "flaky", "rename", "workspace", "status", "agent", "cache"]
+    names = []
+    for _ in range(count):
+        user = rng.choice(["ofirg", "ofirg", "dana", "yoav"])
+        project = rng.choice(["DR", "DR", "INFRA", "WEB"])
+        slug = "-".join(rng.choice(words) for _ in range(rng.randint(2, 8)))
+        names.append(f"{user}-{project}-{rng.randint(1, 3000)}-{slug}")
+    return names
+
+
+def check_equivalence(rng: random.Random) -> None:
+    pool = branch_names(40, rng) + ["a", "a-", "a--b", "x.y/z", "x.y/w", "viewer_1 2"]
+    trie = PrefixTrie()
+    synced = PrefixTrie()
+    current: list[str] = []
+    for _ in range(3000):
+        if current and rng.random() < 0.45:
+            name = current.pop(rng.randrange(len(current)))
+            trie.remove(name)
+        else:
+            name = rng.choice(pool)
+            current.append(name)
+            trie.add(name)
+        expected = dict_longest_common_prefix(current)
+        # add/remove keep names in first-insertion order, which may differ from current's order
+        assert trie.names == Counter(current)
+        inserted = [name for name, count in trie.names.items() for _ in range(count)]
+        got = trie.longest_shared_prefix()
+        assert got == dict_longest_common_prefix(inserted), (inserted, got)
+        assert len(got) == len(expected), (current, expected, got)
+        # The daemon's path: one long-lived trie synced to each pass's list
+        synced.sync(current)
+        assert synced.longest_shared_prefix() == expected, (current, expected, synced.longest_shared_prefix())
+        fresh = PrefixTrie()
+        fresh.sync(current)
+        assert fresh.longest_shared_prefix() == expected, (current, expected, fresh.longest_shared_prefix())
+
+
+def timed(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    rng = random.Random(0)
+    check_equivalence(rng)
+    print("equivalence check passed")
+
+    names = branch_names(count, rng)
+    churned = names[1:] + branch_names(1, rng)
+    trie = PrefixTrie()
+    trie.sync(names)
+
+    def incremental():
+        # One session disappears and another appears between passes
+        trie.sync(churned)
+        trie.sync(names)
+
+    print(f"{count} names, avg length {sum(map(len, names)) / count:.0f}")
+    print(f"dict of slices (per pass) {timed(lambda: dict_longest_common_prefix(names), rounds):9.1f}us")
+    print(f"trie from scratch         {timed(lambda: PrefixTrie().sync(names), rounds):9.1f}us")
+    print(f"trie sync, 1 name churned {timed(incremental, rounds) / 2:9.1f}us")
+    print(f"trie sync, unchanged      {timed(lambda: trie.sync(names), rounds):9.1f}us")
+    print(f"trie query                {timed(trie.longest_shared_prefix, rounds * 100):9.3f}us")
+
+
+if __name__ == "__main__":
+    main()
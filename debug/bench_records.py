@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# bench_records.py - Memory and time of __slots__ client records vs raw clients -j dicts
+# Usage: ./bench_records.py [CLIENTS] [ROUNDS]
+# Memory is what stays allocated (tracemalloc) and the RSS growth of holding the decoded
+# clients, time is decoding plus compute_renames over the decoded snapshot, against a frozen
+# copy of the dict-based compute_renames from before records.py
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import benchlib
+import RenameWorkspaces
+from RenameWorkspaces import (AGENT_STATUS_ICONS, BROWSER_CLASSES, MAX_NAME_LENGTH, MONITOR_STATUS_ICONS,
+                              SLACK_CLASSES, SLACK_ICON, TMUX_ICON, TMUX_SUFFIX, VdeskFlags, cached_clean_title,
+                              cached_strip_prefix_and_jira, debug, highest_priority_status, longest_common_prefix)
+from records import client_from_json, vdesk_from_json
+
+
+def rss_kib() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def held(decode) -> tuple[int, int, object]:
+    """Bytes allocated by decode() and still held afterwards, RSS growth in KiB, and the result."""
+    gc.collect()
+    rss_before = rss_kib()
+    tracemalloc.start()
+    result = decode()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, rss_kib() - rss_before, result
+
+
+def dict_compute_names(vdesks: list[dict], clients: list[dict], pinned_classes: set[str],
+                       active_workspace_id: int | None, tmux_statuses: dict[str, tuple[str, list[str]]]
+                       ) -> dict[int, str]:
+    """The original compute_renames over raw printstate/clients -j dicts, kept as the reference.
+
+    Called like compute_renames without rendered: every vdesk is rendered and fingerprinted.
+    """
+    workspace_to_vdesk_id = {ws_id: vdesk.get("id") for vdesk in vdesks for ws_id in vdesk.get("workspaces", [])}
+    active_vdesk_id = workspace_to_vdesk_id.get(active_workspace_id)
+    unpinned_slack_classes = SLACK_CLASSES - pinned_classes
+
+    flags: dict[int, VdeskFlags] = {vdesk.get("id"): VdeskFlags() for vdesk in vdesks}
+    for client in clients:
+        vdesk_id = workspace_to_vdesk_id.get(client.get("workspace", {}).get("id"))
+        if vdesk_id is None:
+            continue
+        desk = flags[vdesk_id]
+        cls = client.get("class", "").lower()
+        if desk.first_client is None:
+            desk.first_client = client
+        if cls in BROWSER_CLASSES:
+            desk.has_browser = True
+            if desk.first_browser is None:
+                desk.first_browser = client
+        if cls in unpinned_slack_classes:
+            desk.has_slack = True
+        if cls not in SLACK_CLASSES:
+            desk.only_slack = False
+
+        title = client.get("title", "")
+        if not title.endswith(TMUX_SUFFIX):
+            continue
+        name = cached_clean_title(title[:-len(TMUX_SUFFIX)])
+
+        agent_status, monitor_statuses = tmux_statuses.get(name, ("", []))
+        if agent_status:
+            debug(f"vdesk {vdesk_id} tmux {name!r} contributes agent status {agent_status!r}")
+            desk.statuses.append(agent_status)
+        for ms in monitor_statuses:
+            debug(f"vdesk {vdesk_id} tmux {name!r} contributes monitor status {ms!r}")
+            desk.statuses.append(ms)
+
+        agent_icon = AGENT_STATUS_ICONS.get(agent_status, TMUX_ICON)
+        monitor_icons = "".join(MONITOR_STATUS_ICONS[s] for s in monitor_statuses if s in MONITOR_STATUS_ICONS)
+        name = cached_strip_prefix_and_jira(name, vdesk_id == active_vdesk_id)
+        if name.endswith("-viewer"):
+            desk.viewer.append((agent_icon, monitor_icons, name))
+        else:
+            desk.tmux.append((agent_icon, monitor_icons, name))
+
+    prefix = longest_common_prefix(
+        [name for desk in flags.values() for entries in (desk.tmux, desk.viewer) for _, _, name in entries]
+    )
+
+    def format_tmux_entry(agent_icon: str, monitor_icons: str, raw_name: str, use_full: bool) -> str:
+        if use_full or not raw_name.startswith(prefix):
+            name = raw_name
+        else:
+            name = raw_name[len(prefix):] or raw_name
+        prefix_icons = agent_icon + (" " + monitor_icons if monitor_icons else "")
+        display = f"{prefix_icons} {name}"
+        if len(display) > MAX_NAME_LENGTH:
+            display = display[:MAX_NAME_LENGTH] + "…"
+        return display
+
+    names, statuses, rendered = {}, {}, {}
+    for vdesk_id, desk in flags.items():
+        statuses[vdesk_id] = highest_priority_status(desk.statuses)
+        debug(f"vdesk {vdesk_id} statuses={desk.statuses} -> {statuses[vdesk_id]!r}")
+        entries = desk.tmux or desk.viewer
+        icon_flags = (desk.has_slack, desk.has_browser)
+        chosen = desk.first_browser or desk.first_client
+        if entries:
+            is_active = vdesk_id == active_vdesk_id
+            fingerprint = (icon_flags, tuple(entries), is_active, prefix)
+            formatted = [format_tmux_entry(a, m, name, is_active) for a, m, name in entries]
+            name = f"{vdesk_id} {desk.icons_prefix()}{'|'.join(formatted)}"
+        else:
+            fingerprint = (icon_flags, desk.only_slack, chosen.get("title", "") if chosen else None)
+            name = dict_name_title_vdesk(vdesk_id, desk)
+        names[vdesk_id] = name
+        rendered[vdesk_id] = (fingerprint, name)
+    return names
+
+
+def dict_name_title_vdesk(vdesk_id: int, desk: VdeskFlags) -> str:
+    chosen = desk.first_browser or desk.first_client
+    if chosen is None:
+        return f"{vdesk_id}"
+    title = cached_clean_title(chosen.get("title", ""))
+    if not title:
+        return f"{vdesk_id}"
+    if desk.has_slack and not desk.has_browser and desk.only_slack:
+        return f"{vdesk_id} {SLACK_ICON} Slack"
+    if len(title) > MAX_NAME_LENGTH:
+        title = title[:MAX_NAME_LENGTH] + "…"
+    return f"{vdesk_id} {desk.icons_prefix()}{title}"
+
+
+def timed(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    session = benchlib.synthetic_session(count)
+    clients_json = json.dumps(session["clients"], indent=4)
+    vdesks = [vdesk_from_json(v) for v in session["printstate"]]
+
+    dict_bytes, dict_rss, dicts = held(lambda: json.loads(clients_json))
+    del dicts
+    record_bytes, record_rss, records = held(lambda: [client_from_json(c) for c in json.loads(clients_json)])
+    print(f"{count} clients held in memory")
+    print(f"raw dicts   {dict_bytes / 1024:8.0f} KiB traced  {dict_rss:6d} KiB RSS")
+    print(f"records     {record_bytes / 1024:8.0f} KiB traced  {record_rss:6d} KiB RSS"
+          f"  ({dict_bytes / record_bytes:.1f}x smaller)")
+
+    snapshot = RenameWorkspaces.Snapshot(vdesks, records, set(), 1, {})
+    decode_dicts = timed(lambda: json.loads(clients_json), rounds)
+    decode_records = timed(lambda: [client_from_json(c) for c in json.loads(clients_json)], rounds)
+    # No render cache, so every vdesk is rendered like on a full pass
+    compute = timed(lambda: RenameWorkspaces.compute_renames(snapshot), rounds)
+    print(f"decode json only               {decode_dicts:7.2f}ms")
+    print(f"decode into records            {decode_records:7.2f}ms")
+    dicts = json.loads(clients_json)
+    assert dict_compute_names(session["printstate"], dicts, set(), 1, {}) == \
+        RenameWorkspaces.compute_renames(snapshot).names, "dict reference disagrees"
+    compute_dicts = timed(lambda: dict_compute_names(session["printstate"], dicts, set(), 1, {}), rounds)
+    print(f"compute_renames over dicts     {compute_dicts:7.2f}ms")
+    print(f"compute_renames over records   {compute:7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# bench_rename.py - Benchmark RenameWorkspaces rename passes against fixtures and stand-in hyprctl/tmux
+# Usage: ./bench_rename.py [--sizes 10,100,1000] [--passes 200] [--cold] [--churn]
+#        ./bench_rename.py --fixtures DIR       # replay a recorded session
+#        ./bench_rename.py --record DIR         # record the live session into DIR
+#        ./bench_rename.py --ipc                # serve hyprctl queries from fake_hyprland.py over the socket
+# Runs without Hyprland: debug/fake-bin is put first on PATH and serves the fixtures
+
+import argparse
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+import benchlib
+from fake_hyprland import FakeHyprland
+
+
+def bench_session(label: str, session: dict, passes: int, cold: bool, churn: bool, ipc: bool) -> None:
+    with tempfile.TemporaryDirectory(prefix="bench-rename-") as tmp:
+        fork_log = benchlib.use_fake_session(session, tmp)
+        server = None
+        if ipc:
+            server = FakeHyprland(session, tmp)
+            server.start()
+            os.environ.update(server.env())
+
+        import RenameWorkspaces
+        RenameWorkspaces = importlib.reload(RenameWorkspaces)
+        config_path = os.path.join(tmp, "VirtualDesktopsNames.conf")
+
+        latencies: list[float] = []
+        forks: list[int] = []
+        clients = session["clients"]
+        for i in range(passes):
+            if cold:
+                # One-shot mode starts every pass with a fresh module
+                RenameWorkspaces = importlib.reload(RenameWorkspaces)
+            RenameWorkspaces.CONFIG_LOC = config_path
+            if churn and clients:
+                clients[i % len(clients)]["title"] = f"build output {i} - TMUX"
+                benchlib.write_fixtures(session, os.environ["BENCH_FIXTURES"])
+            forks_before = benchlib.count_forks(fork_log)
+            start = time.perf_counter()
+            RenameWorkspaces.rename_pass()
+            latencies.append((time.perf_counter() - start) * 1000)
+            forks.append(benchlib.count_forks(fork_log) - forks_before)
+
+        requests = ""
+        if server is not None:
+            server.stop()
+            os.environ.pop("HYPRLAND_INSTANCE_SIGNATURE")
+            requests = f" requests/pass={len(server.requests) / passes:5.2f}"
+
+    print(f"{label:<22} {benchlib.format_latencies(latencies)} "
+          f"forks/pass={sum(forks) / len(forks):5.2f} (first={forks[0]}, max={max(forks)}){requests}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RenameWorkspaces rename passes")
+    parser.add_argument("--sizes", default="10,100,1000", help="Comma separated synthetic client counts")
+    parser.add_argument("--sessions", type=int, default=25, help="tmux sessions in synthetic desktops")
+    parser.add_argument("--passes", type=int, default=200)
+    parser.add_argument("--cold", action="store_true", help="Reload the module before each pass (one-shot mode)")
+    parser.add_argument("--churn", action="store_true", help="Change one window title before each pass")
+    parser.add_argument("--fixtures", help="Benchmark a recorded fixture directory instead of synthetic desktops")
+    parser.add_argument("--record", metavar="DIR", help="Record the live session into DIR and exit")
+    parser.add_argument("--ipc", action="store_true",
+                        help="Serve hyprctl queries from the in-process stand-in IPC server (its JSON encoding is timed too)")
+    args = parser.parse_args()
+
+    if args.record:
+        benchlib.record_fixtures(args.record)
+        print(f"Recorded fixtures into {args.record}")
+        return
+
+    print(f"{args.passes} passes per desktop, {'cold' if args.cold else 'warm'} module"
+          f"{', churning titles' if args.churn else ''}")
+    if args.fixtures:
+        bench_session(os.path.basename(args.fixtures.rstrip("/")), benchlib.load_fixtures(args.fixtures),
+                      args.passes, args.cold, args.churn, args.ipc)
+        return
+    for size in (int(s) for s in args.sizes.split(",")):
+        session = benchlib.synthetic_session(size, n_sessions=args.sessions)
+        bench_session(f"{size} clients", session, args.passes, args.cold, args.churn, args.ipc)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# bench_title.py - Compare clean_title with the original regex-based version
+# Usage: ./bench_title.py [ROUNDS]
+# Checks both agree on titles without newly covered emoji, shows what the emoji table adds,
+# then times both on realistic browser and terminal titles
+
+import re
+import sys
+import time
+
+import benchlib
+from RenameWorkspaces import clean_title
+
+# The original emojis.EMOJI_RE, kept as the reference
+ORIGINAL_EMOJI_RE = re.compile(
+    "["
+    "\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF"
+    "\U0001F900-\U0001F9FF\U0001FA00-\U0001FA6F\U0001FA70-\U0001FAFF\U00002702-\U000027B0"
+    "\U0000FE00-\U0000FE0F\U0000200D\U000020E3\U00002600-\U000026FF\U0000231A-\U0000231B"
+    "\U00002934-\U00002935\U000025AA-\U000025AB\U000025FB-\U000025FE\U00002B05-\U00002B07"
+    "\U00002B1B-\U00002B1C\U00002B50\U00002B55\U00003030\U0000303D\U00003297\U00003299"
+    "]+",
+    flags=re.UNICODE,
+)
+
+NEWLY_COVERED = ["⏰ standup in 5", "▶️ Play - YouTube", "🆗 deploy done", "🀄 mahjong", "⌨️ keyboard.conf",
+                 "🏴󠁧󠁢󠁳󠁣󠁴󠁿 Scotland - Wikipedia"]
+
+
+def original_clean_title(title: str) -> str:
+    title = ORIGINAL_EMOJI_RE.sub("", title)
+    title = title.replace("「", "").replace("」", "")
+    title = re.sub(r"\s+", " ", title)
+    return title.strip()
+
+
+def titles() -> list[str]:
+    session = benchlib.synthetic_session(1000)
+    return [client["title"] for client in session["clients"]] + [
+        "  ~/src/hypr-dots\t(main)   nvim  ",
+        "「DR-1300」 　Review 🚀🚀 rename pass\n - Jira",
+        "Inbox (3) – ofir@example.com – Gmail 📬",
+    ]
+
+
+def timed(fn, samples: list[str], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for title in samples:
+            fn(title)
+    return (time.perf_counter() - start) / (rounds * len(samples)) * 1e9
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    samples = titles()
+    for title in samples:
+        assert clean_title(title) == original_clean_title(title), (title, clean_title(title))
+    print("equivalence check passed")
+    for title in NEWLY_COVERED:
+        print(f"  {original_clean_title(title)!r:40} -> {clean_title(title)!r}")
+
+    ascii_titles = [t for t in samples if t.isascii()]
+    unicode_titles = [t for t in samples if not t.isascii()]
+    print(f"{len(samples)} titles ({len(unicode_titles)} non-ASCII), per title:")
+    for label, subset in (("all", samples), ("ascii", ascii_titles), ("non-ascii", unicode_titles)):
+        before = timed(original_clean_title, subset, rounds)
+        after = timed(clean_title, subset, rounds)
+        print(f"{label:<10} regex {before:7.0f}ns  set lookup {after:7.0f}ns  ({before / after:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# benchlib.py - Shared helpers for the rename benchmarks: synthetic sessions, fixtures, stats
+# Fixture directories hold one <query>.json per hyprctl query plus tmux.txt
+# (`tmux list-windows -a -F '#{session_name}|#{@ai-agent-status}|#{@monitor-status}'` output)
+
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+
+DEBUG_DIR = os.path.dirname(os.path.abspath(__file__))
+USER_SCRIPTS_DIR = os.path.join(DEBUG_DIR, "..", "hypr", "UserScripts")
+FAKE_BIN_DIR = os.path.join(DEBUG_DIR, "fake-bin")
+
+sys.path.insert(0, USER_SCRIPTS_DIR)
+
+HYPRCTL_QUERIES = ["printstate", "clients", "printpinnedwindows", "activeworkspace"]
+TMUX_FORMAT = "#{session_name}|#{@ai-agent-status}|#{@monitor-status}"
+
+BROWSER_TITLES = [
+    "GitHub - ofirgall/hypr-dots: 🚀 dotfiles — Mozilla Firefox",
+    "「DR-1299」 Fix flaky rename test - Jira",
+    "Pull request #4242 · review requested 👀 - Google Chrome",
+    "YouTube — lofi hip hop radio 📚 beats to relax/study to",
+]
+OTHER_TITLES = ["Slack | #general | 3 new items", "zsh", "", "  nvim  ~/src/project  ", "Spotify Premium"]
+STATUSES = ["", "", "IDLE", "DONE", "WAITING", "INPROGRESS"]
+
+
+def session_name(i: int) -> str:
+    if i % 5 == 4:
+        return f"ofirg-DR-{1200 + i}-viewer"
+    return f"ofirg-DR-{1200 + i}-fix-{'long-' * (i % 3)}branch-{i}"
+
+
+def synthetic_session(n_clients: int, n_vdesks: int = 10, n_sessions: int = 25, seed: int = 0) -> dict:
+    """Build hyprctl/tmux outputs for a fake session with n_clients windows over n_vdesks (2 monitors)."""
+    rng = random.Random(seed)
+    vdesks = [{"id": i, "name": str(i), "focused": i == 1, "populated": True,
+               "workspaces": [2 * i - 1, 2 * i]} for i in range(1, n_vdesks + 1)]
+    sessions = [session_name(i) for i in range(n_sessions)]
+    clients = []
+    for i in range(n_clients):
+        vdesk = vdesks[i % n_vdesks]
+        ws_id = rng.choice(vdesk["workspaces"])
+        kind = rng.random()
+        if kind < 0.4:
+            cls, title = "kitty", f"{rng.choice(sessions)} - TMUX"
+        elif kind < 0.7:
+            cls, title = rng.choice(["firefox", "google-chrome"]), rng.choice(BROWSER_TITLES)
+        elif kind < 0.8:
+            cls, title = "Slack", OTHER_TITLES[0]
+        else:
+            cls, title = rng.choice(["kitty", "code", "spotify"]), rng.choice(OTHER_TITLES)
+        # Keep the full clients -j shape, including the fields the renamer never reads
+        clients.append({
+            "address": f"0x{0x55d0a0000000 + i * 0x1000:x}", "mapped": True, "hidden": False,
+            "at": [rng.randrange(3840), rng.randrange(2160)], "size": [1280, 1400],
+            "workspace": {"id": ws_id, "name": str(ws_id)}, "floating": False, "pseudo": False,
+            "monitor": ws_id % 2, "class": cls, "title": title, "initialClass": cls, "initialTitle": title,
+            "pid": 10000 + i, "xwayland": False, "pinned": False, "fullscreen": 0, "fullscreenClient": 0,
+            "grouped": [], "tags": [], "swallowing": "0x0", "focusHistoryID": i, "inhibitingIdle": False,
+            "xdgTag": "", "xdgDescription": "",
+        })
+    tmux_lines = [
+        f"{name}|{rng.choice(STATUSES)}|{rng.choice(['', '', 'INPROGRESS'])}"
+        for name in sessions for _ in range(rng.randint(1, 4))
+    ]
+    return {
+        "printstate": vdesks,
+        "clients": clients,
+        "printpinnedwindows": [{"class": "Slack"}] if seed % 2 else [],
+        "activeworkspace": {"id": 1, "name": "1"},
+        "tmux": tmux_lines,
+    }
+
+
+def write_fixtures(session: dict, directory: str) -> None:
+    os.makedirs(directory, exist_ok=True)
+    for query in HYPRCTL_QUERIES:
+        with open(os.path.join(directory, f"{query}.json"), "w") as f:
+            json.dump(session[query], f, indent=4, ensure_ascii=False)
+    with open(os.path.join(directory, "tmux.txt"), "w") as f:
+        f.write("\n".join(session["tmux"]) + "\n")
+
+
+def load_fixtures(directory: str) -> dict:
+    session = {}
+    for query in HYPRCTL_QUERIES:
+        with open(os.path.join(directory, f"{query}.json")) as f:
+            session[query] = json.load(f)
+    with open(os.path.join(directory, "tmux.txt")) as f:
+        session["tmux"] = f.read().splitlines()
+    return session
+
+
+def use_fake_session(session: dict, directory: str) -> str:
+    """Serve session through the stand-in hyprctl/tmux in debug/fake-bin. Returns the fork log path.
+
+    XDG_RUNTIME_DIR points at directory, so there is no Hyprland socket and the renamer
+    falls back to the stand-in hyprctl.
+    """
+    fixtures_dir = os.path.join(directory, "fixtures")
+    fork_log = os.path.join(directory, "forks.log")
+    write_fixtures(session, fixtures_dir)
+    os.environ["BENCH_FIXTURES"] = fixtures_dir
+    os.environ["BENCH_FORK_LOG"] = fork_log
+    os.environ["XDG_RUNTIME_DIR"] = directory
+    if not os.environ.get("PATH", "").startswith(FAKE_BIN_DIR + os.pathsep):
+        os.environ["PATH"] = FAKE_BIN_DIR + os.pathsep + os.environ.get("PATH", "")
+    return fork_log
+
+
+def count_forks(fork_log: str) -> int:
+    try:
+        with open(fork_log) as f:
+            return sum(1 for _ in f)
+    except FileNotFoundError:
+        return 0
+
+
+def live_session() -> dict:
+    """Snapshot the live Hyprland/tmux session in the same shape as synthetic_session."""
+    session = {}
+    for query in HYPRCTL_QUERIES:
+        output = subprocess.run(["hyprctl", query, "-j"], capture_output=True, text=True, check=True).stdout
+        session[query] = json.loads(output)
+    output = subprocess.run(["tmux", "list-windows", "-a", "-F", TMUX_FORMAT], capture_output=True, text=True).stdout
+    session["tmux"] = output.splitlines()
+    return session
+
+
+def record_fixtures(directory: str) -> None:
+    """Record the live Hyprland/tmux session into a fixture directory."""
+    write_fixtures(live_session(), directory)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of unsorted samples."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def format_latencies(samples_ms: list[float]) -> str:
+    return (f"p50={percentile(samples_ms, 50):7.2f}ms p95={percentile(samples_ms, 95):7.2f}ms "
+            f"p99={percentile(samples_ms, 99):7.2f}ms")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# capture_events.py - Record the Hyprland socket2 event stream with timestamps for replay_events.py
+# Usage: ./capture_events.py OUTPUT.jsonl [--duration SECONDS]
+# The first line is a snapshot of the session (hyprctl queries + tmux statuses) taken before
+# listening, every following line is {"t": seconds since the snapshot, "line": "event>>data"}
+# Stop with Ctrl+C (or --duration)
+
+import argparse
+import json
+import socket
+import sys
+import time
+
+import benchlib  # noqa: F401  (puts hypr/UserScripts on sys.path)
+import hypr_ipc
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record timestamped socket2 events")
+    parser.add_argument("output", help="JSON-lines file to write")
+    parser.add_argument("--duration", type=float, help="Stop after this many seconds")
+    args = parser.parse_args()
+
+    events = 0
+    with open(args.output, "w") as out, socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(hypr_ipc.event_socket_path())
+        # Snapshot after connecting so no event between the two is lost
+        out.write(json.dumps({"session": benchlib.live_session()}, ensure_ascii=False) + "\n")
+        start = time.monotonic()
+        deadline = start + args.duration if args.duration else None
+        print(f"Recording into {args.output}, Ctrl+C to stop", file=sys.stderr)
+        buffer = b""
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                sock.settimeout(max(0.001, deadline - time.monotonic()) if deadline else None)
+                try:
+                    chunk = sock.recv(65536)
+                except socket.timeout:
+                    break
+                if not chunk:
+                    break
+                now = time.monotonic() - start
+                *lines, buffer = (buffer + chunk).split(b"\n")
+                for line in lines:
+                    out.write(json.dumps({"t": round(now, 6), "line": line.decode(errors="replace")},
+                                         ensure_ascii=False) + "\n")
+                    events += 1
+        except KeyboardInterrupt:
+            pass
+    print(f"Recorded {events} events", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# check_weather_imports.py - Fail if a cache-hit Weather.py run imports too much
+# Usage: ./check_weather_imports.py [--budget-ms 30] [--runs 5] [-v]
+# Seeds a throwaway HOME with a fresh weather cache, runs Weather.py under -X importtime and
+# exits 1 if it imports any of the HTTP stack (or the other modules only a miss needs), or if
+# the import time on top of the interpreter's own startup exceeds the budget (best of --runs).
+# Checks both ways a cache hit finds its location: WEATHER_LAT/WEATHER_LON, and the default
+# config's cached IP geolocation, matched against the current network fingerprint
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import benchlib
+
+WEATHER_SCRIPT = os.path.join(benchlib.USER_SCRIPTS_DIR, "Weather.py")
+# Top-level packages a cache hit must not load
+FORBIDDEN = {"requests", "urllib3", "charset_normalizer", "idna", "certifi", "http", "ssl", "socket",
+             "html", "threading", "queue", "pathlib", "dataclasses", "inspect"}
+LAT, LON = 1.0, 2.0
+
+
+def importtime(args: list[str], env: dict[str, str]) -> tuple[list[tuple[str, int]], str]:
+    """Run python -X importtime args; return top-level (module, cumulative us) pairs and stdout."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], env=env, capture_output=True, text=True)
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or line.endswith("imported package"):
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented under the module that triggered them
+        if not name.startswith("  "):
+            imports.append((name.strip(), int(cumulative)))
+    return imports, proc.stdout
+
+
+def seed_cache(home: str) -> dict[str, dict[str, str]]:
+    """Write fresh weather, location and geocoding caches into home.
+
+    Returns the environment of each scenario, all of which should be answered from the cache.
+    """
+    env = {k: v for k, v in os.environ.items() if not k.startswith("WEATHER_")}
+    env["HOME"] = home
+    os.environ.clear()
+    os.environ.update(env)
+    import Weather
+
+    Weather.write_api_cache({"forecast": {"latitude": LAT, "longitude": LON, "current": {"temperature_2m": 20},
+                                          "current_units": {}, "daily": {}, "daily_units": {}},
+                             "aqi": None, "place": "Import check"})
+    # Stamped with this machine's network fingerprint, like after an IP geolocation
+    Weather.write_location_cache(LAT, LON)
+    if Weather.MANUAL_PLACE:
+        # MANUAL_PLACE wins over WEATHER_LAT/LON and is geocoded; answer that from the cache too
+        Weather.geocode_cache_put("forward", Weather.forward_geocode_key(Weather.MANUAL_PLACE.strip()), [LAT, LON])
+    return {"env coordinates": dict(env, WEATHER_LAT=str(LAT), WEATHER_LON=str(LON)),
+            "location cache": env}
+
+
+def check_scenario(label: str, env: dict[str, str], args) -> bool:
+    startup = {name for name, _ in importtime(["-c", "pass"], env)[0]}
+    runs = []
+    for _ in range(args.runs):
+        imports, stdout = importtime([WEATHER_SCRIPT], env)
+        try:
+            output = json.loads(stdout)
+        except ValueError:
+            output = {}
+        if output.get("class") == "unavailable" or "Import check" not in output.get("tooltip", ""):
+            print(f"FAIL: {label}: Weather.py did not answer from the cache: {stdout.strip()}", file=sys.stderr)
+            return False
+        runs.append([(name, us) for name, us in imports if name not in startup])
+
+    best = min(runs, key=lambda imports: sum(us for _, us in imports))
+    total_ms = sum(us for _, us in best) / 1000
+    loaded = {name for imports in runs for name, _ in imports}
+    if args.verbose:
+        for name, us in sorted(best, key=lambda item: -item[1]):
+            print(f"{us / 1000:8.2f}ms  {name}")
+    forbidden = sorted(name for name in loaded if name.split(".")[0] in FORBIDDEN)
+    print(f"{label}: cache-hit imports {total_ms:.1f}ms (budget {args.budget_ms:g}ms): "
+          f"{', '.join(name for name, _ in best)}")
+    if forbidden:
+        print(f"FAIL: {label}: cache hit imported {', '.join(forbidden)}", file=sys.stderr)
+        return False
+    if total_ms > args.budget_ms:
+        print(f"FAIL: {label}: import time over budget by {total_ms - args.budget_ms:.1f}ms", file=sys.stderr)
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-ms", type=float, default=30.0, help="Import time allowed on top of startup")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("-v", "--verbose", action="store_true", help="List the imports of the best run")
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as home:
+        scenarios = seed_cache(home)
+        for label, env in scenarios.items():
+            failed |= not check_scenario(label, env, args)
+    if failed:
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
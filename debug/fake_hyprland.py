@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# fake_hyprland.py - Stand-in Hyprland IPC server for running the renamer without a live session
+# Usage: ./fake_hyprland.py [--clients 200] [--title-rate 40] [--vdesk-rate 0.5] [--duration 10]
+#        ./fake_hyprland.py --daemon [--rename-mode dispatch] ...   # also run RenameWorkspaces.py --daemon and report
+#        ./fake_hyprland.py --daemon --rename-mode dispatch --without-dispatcher vdeskrename   # plugin without it
+# Serves .socket.sock/.socket2.sock under a temporary XDG_RUNTIME_DIR from a synthetic session
+# (same shape as benchlib.synthetic_session), emits synthetic events at the given rates and
+# records every request and dispatch it receives
+
+import argparse
+import heapq
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import benchlib
+import hypr_ipc
+
+# Request flags come before a '/', e.g. "j/clients"
+FLAGS_RE = re.compile(r"^[a-z]*/")
+QUERIES = ["clients", "printstate", "printpinnedwindows", "activeworkspace"]
+EVENT_KINDS = ["title", "vdesk", "open", "move"]
+
+
+class FakeHyprland:
+    """Hyprland IPC stand-in over a session dict.
+
+    The session is used as the model directly: queries are answered from it, dispatches
+    and the event helpers below update it, and callers may mutate it between requests.
+    """
+
+    def __init__(self, session: dict, runtime_dir: str, signature: str = "fake",
+                 missing_dispatchers: frozenset[str] = frozenset()):
+        self.session = session
+        # Dispatchers answered like a plugin build that doesn't have them
+        self.missing_dispatchers = missing_dispatchers
+        self.runtime_dir = runtime_dir
+        self.signature = signature
+        self.socket_dir = os.path.join(runtime_dir, "hypr", signature)
+        self.requests: list[str] = []
+        self.dispatches: list[tuple[str, str]] = []
+        self.statuses: dict[int, str] = {}
+        self.events_emitted = 0
+        self._lock = threading.Lock()
+        self._listeners: list[socket.socket] = []
+        self._servers: list[socket.socket] = []
+        self._next_address = 0x7f0000000000
+
+    def env(self) -> dict[str, str]:
+        return {"XDG_RUNTIME_DIR": self.runtime_dir, "HYPRLAND_INSTANCE_SIGNATURE": self.signature}
+
+    def start(self) -> None:
+        os.makedirs(self.socket_dir, exist_ok=True)
+        for name, serve in ((".socket.sock", self._serve_request), (".socket2.sock", self._add_listener)):
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(os.path.join(self.socket_dir, name))
+            server.listen(64)
+            self._servers.append(server)
+            threading.Thread(target=self._accept, args=(server, serve), daemon=True).start()
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.close()
+        with self._lock:
+            for listener in self._listeners:
+                listener.close()
+            self._listeners.clear()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.dispatches.clear()
+            self.events_emitted = 0
+
+    def listener_count(self) -> int:
+        with self._lock:
+            return len(self._listeners)
+
+    def _accept(self, server: socket.socket, serve) -> None:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            serve(conn)
+
+    def _add_listener(self, conn: socket.socket) -> None:
+        with self._lock:
+            self._listeners.append(conn)
+
+    def _serve_request(self, conn: socket.socket) -> None:
+        with conn:
+            # Like Hyprland, a request is a single read
+            request = conn.recv(65536).decode(errors="replace")
+            conn.sendall(self.handle_request(request).encode())
+
+    # Requests
+
+    def handle_request(self, request: str) -> str:
+        with self._lock:
+            self.requests.append(request)
+            if request.startswith(hypr_ipc.BATCH_PREFIX):
+                commands = request[len(hypr_ipc.BATCH_PREFIX):].split(";")
+                return hypr_ipc.BATCH_DELIMITER.join(self._handle_command(c) for c in commands)
+            return self._handle_command(request)
+
+    def _handle_command(self, command: str) -> str:
+        command = FLAGS_RE.sub("", command.strip())
+        name, _, args = command.partition(" ")
+        if name in QUERIES:
+            return json.dumps(self.session[name], indent=4, ensure_ascii=False)
+        if name != "dispatch":
+            return "unknown request"
+        dispatcher, _, args = args.partition(" ")
+        self.dispatches.append((dispatcher, args))
+        if dispatcher in self.missing_dispatchers:
+            return "Invalid dispatcher"
+        if dispatcher in ("vdesksetstatus", "vdeskrename"):
+            vdesk_id, _, value = args.partition(",")
+            if dispatcher == "vdesksetstatus":
+                self.statuses[int(vdesk_id)] = value
+            else:
+                for vdesk in self.session["printstate"]:
+                    if vdesk["id"] == int(vdesk_id):
+                        vdesk["name"] = value
+        return "ok"
+
+    # Events
+
+    def emit(self, *lines: str) -> None:
+        payload = "".join(line + "\n" for line in lines).encode()
+        with self._lock:
+            self.events_emitted += len(lines)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener.sendall(payload)
+            except OSError:
+                with self._lock:
+                    self._listeners.remove(listener)
+
+    def _client(self, address: str) -> dict:
+        return next(c for c in self.session["clients"] if c["address"] == address)
+
+    def set_title(self, address: str, title: str) -> None:
+        with self._lock:
+            client = self._client(address)
+            client["title"] = title
+        self.emit(f"windowtitle>>{address[2:]}", f"windowtitlev2>>{address[2:]},{title}")
+
+    def open_window(self, cls: str, title: str, ws_id: int) -> str:
+        with self._lock:
+            address = f"0x{self._next_address:x}"
+            self._next_address += 0x1000
+            self.session["clients"].append({"address": address, "class": cls, "title": title,
+                                            "workspace": {"id": ws_id, "name": str(ws_id)}})
+        self.emit(f"openwindow>>{address[2:]},{ws_id},{cls},{title}")
+        return address
+
+    def close_window(self, address: str) -> None:
+        with self._lock:
+            self.session["clients"].remove(self._client(address))
+        self.emit(f"closewindow>>{address[2:]}")
+
+    def move_window(self, address: str, ws_id: int) -> None:
+        with self._lock:
+            self._client(address)["workspace"] = {"id": ws_id, "name": str(ws_id)}
+        self.emit(f"movewindow>>{address[2:]},{ws_id}", f"movewindowv2>>{address[2:]},{ws_id},{ws_id}")
+
+    def focus_vdesk(self, vdesk_id: int) -> None:
+        with self._lock:
+            for vdesk in self.session["printstate"]:
+                vdesk["focused"] = vdesk["id"] == vdesk_id
+                if vdesk["focused"]:
+                    ws_id = vdesk["workspaces"][0]
+            self.session["activeworkspace"] = {"id": ws_id, "name": str(ws_id)}
+        self.emit(f"workspace>>{ws_id}", f"workspacev2>>{ws_id},{ws_id}", f"vdesk>>{vdesk_id}")
+
+    def generate(self, rates: dict[str, float], duration: float, seed: int = 0) -> None:
+        """Emit events of each kind in EVENT_KINDS at rates[kind] per second for duration seconds."""
+        rng = random.Random(seed)
+        schedule = [(0.0, kind) for kind, rate in rates.items() if rate > 0]
+        heapq.heapify(schedule)
+        start = time.monotonic()
+        while schedule:
+            at, kind = heapq.heappop(schedule)
+            if at >= duration:
+                continue
+            delay = start + at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._generate_one(kind, rng)
+            heapq.heappush(schedule, (at + 1 / rates[kind], kind))
+
+    def _generate_one(self, kind: str, rng: random.Random) -> None:
+        clients = self.session["clients"]
+        vdesks = self.session["printstate"]
+        if kind == "title":
+            # A busy terminal: always the same window, cycling through tmux sessions
+            terminal = next((c for c in clients if c["class"] == "kitty"), None)
+            if terminal is not None:
+                self.set_title(terminal["address"], f"{benchlib.session_name(rng.randrange(25))} - TMUX")
+        elif kind == "vdesk":
+            self.focus_vdesk(rng.choice(vdesks)["id"])
+        elif kind == "open":
+            # Keep the client count stable: open one window and close the oldest
+            self.open_window("kitty", "zsh", rng.choice(rng.choice(vdesks)["workspaces"]))
+            self.close_window(clients[0]["address"])
+        elif kind == "move" and clients:
+            self.move_window(rng.choice(clients)["address"], rng.choice(rng.choice(vdesks)["workspaces"]))
+
+
+def run_daemon(server: FakeHyprland, tmp: str, args) -> subprocess.Popen:
+    """Start RenameWorkspaces.py --daemon against the stand-in, with HOME moved into tmp
+    so the names config is not written over the real one."""
+    fixtures_dir = os.path.join(tmp, "fixtures")
+    benchlib.write_fixtures(server.session, fixtures_dir)
+    os.makedirs(os.path.join(tmp, ".config", "hypr", "UserConfigs"), exist_ok=True)
+    env = dict(os.environ, **server.env(), HOME=tmp, BENCH_FIXTURES=fixtures_dir,
+               BENCH_FORK_LOG=os.path.join(tmp, "forks.log"),
+               PATH=benchlib.FAKE_BIN_DIR + os.pathsep + os.environ.get("PATH", ""))
+    script = os.path.join(benchlib.USER_SCRIPTS_DIR, "RenameWorkspaces.py")
+    return subprocess.Popen([sys.executable, script, "--daemon", "--rename-mode", args.rename_mode], env=env)
+
+
+def report(server: FakeHyprland, elapsed: float, forks: int | None) -> None:
+    requests = server.requests
+    dispatches = Counter(dispatcher for dispatcher, _ in server.dispatches)
+    events = server.events_emitted
+    commands = sum(r.count(";") + 1 if r.startswith(hypr_ipc.BATCH_PREFIX) else 1 for r in requests)
+    print(f"events    {events} in {elapsed:.1f}s")
+    print(f"requests  {len(requests)} ({commands} commands, {len(requests) / max(events, 1):.3f}/event)")
+    for dispatcher, count in sorted(dispatches.items()):
+        print(f"dispatch  {dispatcher}: {count}")
+    if forks is not None:
+        print(f"forks     {forks}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in Hyprland IPC server with synthetic events")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--sessions", type=int, default=25, help="tmux sessions in the synthetic desktop")
+    parser.add_argument("--title-rate", type=float, default=40.0, help="windowtitle events per second")
+    parser.add_argument("--vdesk-rate", type=float, default=0.5, help="vdesk switches per second")
+    parser.add_argument("--open-rate", type=float, default=0.0, help="window open+close pairs per second")
+    parser.add_argument("--move-rate", type=float, default=0.0, help="window moves per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of events (0: serve until Ctrl+C)")
+    parser.add_argument("--daemon", action="store_true", help="Run RenameWorkspaces.py --daemon against it")
+    parser.add_argument("--rename-mode", choices=["reset", "dispatch"], default="reset")
+    parser.add_argument("--without-dispatcher", action="append", default=[], metavar="NAME",
+                        help="Reject this dispatcher like an older plugin build (e.g. vdeskrename)")
+    args = parser.parse_args()
+
+    rates = {"title": args.title_rate, "vdesk": args.vdesk_rate, "open": args.open_rate, "move": args.move_rate}
+    with tempfile.TemporaryDirectory(prefix="fake-hyprland-") as tmp:
+        server = FakeHyprland(benchlib.synthetic_session(args.clients, n_sessions=args.sessions), tmp,
+                              missing_dispatchers=frozenset(args.without_dispatcher))
+        server.start()
+        daemon = None
+        fork_log = os.path.join(tmp, "forks.log")
+        forks_before = 0
+        if args.daemon:
+            daemon = run_daemon(server, tmp, args)
+            while not server.listener_count():
+                time.sleep(0.01)
+            # Let the connect-time pass finish, it's not part of the load
+            time.sleep(1.0)
+            server.reset_counters()
+            forks_before = benchlib.count_forks(fork_log)
+        else:
+            print(" ".join(f"export {key}={value}" for key, value in server.env().items()))
+
+        start = time.monotonic()
+        try:
+            if args.duration:
+                server.generate(rates, args.duration)
+                if daemon is not None:
+                    # Trailing debounced pass
+                    time.sleep(1.0)
+            else:
+                while True:
+                    time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        elapsed = time.monotonic() - start
+        if daemon is not None:
+            daemon.terminate()
+            daemon.wait()
+        forks = benchlib.count_forks(fork_log) - forks_before if daemon is not None else None
+        report(server, elapsed, forks)
+        server.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# replay_events.py - Feed a capture_events.py recording through the daemon's rename pipeline
+# Usage: ./replay_events.py CAPTURE.jsonl [--speed 4] [--min-interval 0.15] [--max-interval 1]
+#        ./replay_events.py --synthetic [--rate 40] [--duration 10]   # busy terminal burst, no capture needed
+# Events go through RenameWorkspaces.handle_event and the real Debouncer at their recorded
+# times divided by --speed; hyprctl/tmux are the debug/fake-bin stand-ins serving the recorded snapshot.
+# Reports passes run, triggers coalesced and event -> rename-applied lag (wall clock),
+# separately for urgent (focus change) triggers
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+import benchlib
+
+
+def load_capture(path: str) -> tuple[dict, list[tuple[float, str]]]:
+    with open(path) as f:
+        session = json.loads(f.readline())["session"]
+        events = [(record["t"], record["line"]) for record in map(json.loads, f)]
+    return session, events
+
+
+def synthetic_capture(rate: float, duration: float) -> tuple[dict, list[tuple[float, str]]]:
+    """A busy terminal retitling rate times per second, plus a vdesk switch every 2 seconds."""
+    session = benchlib.synthetic_session(200)
+    terminal = next(c for c in session["clients"] if c["class"] == "kitty")
+    address = terminal["address"].removeprefix("0x")
+    events = []
+    for i in range(int(rate * duration)):
+        events.append((i / rate, f"windowtitlev2>>{address},{benchlib.session_name(i % 25)} - TMUX"))
+    for i in range(int(duration // 2)):
+        events.append((i * 2 + 1.0, f"vdesk>>{i % 3 + 1}"))
+    events.sort()
+    return session, events
+
+
+async def replay(RenameWorkspaces, events: list[tuple[float, str]], speed: float,
+                 intervals: tuple[float, float], fork_log: str) -> dict:
+    loop = asyncio.get_running_loop()
+    index = RenameWorkspaces.ClientIndex()
+    index.needs_resync = True
+    passes: list[tuple[float, float]] = []
+
+    async def timed_pass():
+        start = time.monotonic()
+        await loop.run_in_executor(None, RenameWorkspaces.rename_pass, index)
+        passes.append((start, time.monotonic()))
+
+    debouncer = RenameWorkspaces.Debouncer(timed_pass, *intervals)
+    # The daemon's connect-time pass, so the first lag samples don't pay for the initial resync
+    debouncer.trigger()
+    await debouncer.wait_idle()
+    passes.clear()
+    debouncer.triggers = debouncer.urgent_triggers = debouncer.passes = 0
+    forks_before = benchlib.count_forks(fork_log)
+
+    triggered: list[tuple[float, bool]] = []
+    start = time.monotonic()
+    for t, line in events:
+        delay = start + t / speed - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        before, urgent_before = debouncer.triggers, debouncer.urgent_triggers
+        RenameWorkspaces.handle_event(line, debouncer, index)
+        if debouncer.triggers != before:
+            triggered.append((time.monotonic(), debouncer.urgent_triggers != urgent_before))
+    await debouncer.wait_idle()
+
+    # An event is applied by the first pass that started after it (the pass reads the index then)
+    lags: dict[bool, list[float]] = {False: [], True: []}
+    for at, urgent in triggered:
+        end = next((end for pass_start, end in passes if pass_start >= at), None)
+        if end is not None:
+            lags[urgent].append((end - at) * 1000)
+    return {"triggers": debouncer.triggers, "urgent": debouncer.urgent_triggers, "passes": debouncer.passes,
+            "lags_ms": lags[False], "urgent_lags_ms": lags[True],
+            "forks": benchlib.count_forks(fork_log) - forks_before,
+            "pass_ms": [(end - pass_start) * 1000 for pass_start, end in passes]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded socket2 events through the rename pipeline")
+    parser.add_argument("capture", nargs="?", help="File written by capture_events.py")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay N times faster than recorded")
+    parser.add_argument("--min-interval", type=float, help="Quiet period after a pass (default: the daemon's)")
+    parser.add_argument("--max-interval", type=float, help="Longest backed-off quiet period (default: the daemon's)")
+    parser.add_argument("--synthetic", action="store_true", help="Replay a synthetic busy-terminal burst instead")
+    parser.add_argument("--rate", type=float, default=40.0, help="Synthetic windowtitle events per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Synthetic burst length in seconds")
+    args = parser.parse_args()
+    if args.synthetic == bool(args.capture):
+        parser.error("give either a capture file or --synthetic")
+
+    session, events = (synthetic_capture(args.rate, args.duration) if args.synthetic
+                       else load_capture(args.capture))
+
+    with tempfile.TemporaryDirectory(prefix="replay-events-") as tmp:
+        fork_log = benchlib.use_fake_session(session, tmp)
+        import RenameWorkspaces
+        RenameWorkspaces = importlib.reload(RenameWorkspaces)
+        RenameWorkspaces.CONFIG_LOC = os.path.join(tmp, "VirtualDesktopsNames.conf")
+        # A resync would reload the recorded snapshot and undo the replayed events
+        RenameWorkspaces.RESYNC_SECONDS = float("inf")
+        intervals = (RenameWorkspaces.MIN_PASS_INTERVAL_SECONDS if args.min_interval is None else args.min_interval,
+                     RenameWorkspaces.MAX_PASS_INTERVAL_SECONDS if args.max_interval is None else args.max_interval)
+
+        span = events[-1][0] / args.speed if events else 0.0
+        print(f"{len(events)} events over {span:.1f}s at {args.speed:g}x, "
+              f"quiet period {intervals[0] * 1000:.0f}-{intervals[1] * 1000:.0f}ms")
+        result = asyncio.run(replay(RenameWorkspaces, events, args.speed, intervals, fork_log))
+
+    triggers, passes = result["triggers"], result["passes"]
+    print(f"events    {len(events)} ({triggers} triggered a rename, {result['urgent']} urgent)")
+    print(f"passes    {passes} ({triggers - passes} triggers coalesced, {result['forks']} forks)")
+    if result["pass_ms"]:
+        print(f"pass      {benchlib.format_latencies(result['pass_ms'])}")
+    if result["lags_ms"]:
+        print(f"lag       {benchlib.format_latencies(result['lags_ms'])}")
+    if result["urgent_lags_ms"]:
+        print(f"lag urg.  {benchlib.format_latencies(result['urgent_lags_ms'])}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
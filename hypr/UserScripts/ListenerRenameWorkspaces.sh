@@ -20,16 +20,10 @@ if [[ ! -f "$RENAME_SCRIPT" ]]; then
 fi
 
 echo "Listening to Hyprland vdesk events..."
-echo "Will execute RenameWorkspaces.py on vdesk events"
+echo "Running RenameWorkspaces.py as a daemon"
 echo "Press Ctrl+C to stop"
 echo "---"
 
-socat -u UNIX-CONNECT:"$SOCKET" - | while read -r event; do
-    case "$event" in
-        vdesk\>\>*)
-            vdesk="${event#vdesk>>}"
-            echo "[vdesk] Event received: $vdesk"
-            python3 "$RENAME_SCRIPT"
-            ;;
-    esac
-done
+# The daemon reads the event socket itself and coalesces bursts of vdesk events,
+# instead of spawning a new python3 per event
+exec python3 "$RENAME_SCRIPT" --daemon "$@"
@@ -7,20 +7,50 @@ Vdesks with no clients at all are renamed to their ID only.
 """
 
 import argparse
+import html
 import json
 import os
 import re
 import subprocess
 import sys
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Awaitable, Callable
 
-from emojis import EMOJI_RE
+import hypr_ipc
+from emojis import EMOJI_CHARS
 from hypr_enums import AGENT_STATUS
 from icons import TMUX_ICON, BROWSER_ICON, SLACK_ICON, AGENT_STATUS_ICONS, MONITOR_STATUS_ICONS
+from memo_cache import LRUMemo
+from metrics import PassMetrics
+from prefix_trie import PrefixTrie
+from records import Client, Vdesk, Workspace, clients_from_text, vdesk_from_json, workspace_from_json
+from window_model import MODEL_EVENTS, ClientIndex
+
+# asyncio alone costs more to import than a one-shot pass takes, so it (and tmux_control,
+# which needs it) is only imported by the daemon code
+if TYPE_CHECKING:
+    import asyncio
 
 
 CONFIG_LOC = os.path.expanduser("~/.config/hypr/UserConfigs/VirtualDesktopsNames.conf")
 MAX_NAME_LENGTH = 20
 
+TMUX_SUFFIX = " - TMUX"
+BROWSER_CLASSES = {"firefox", "firefox_firefox", "chromium", "google-chrome", "brave-browser", "vivaldi", "zen", "zen-browser"}
+SLACK_CLASSES = {"slack"}
+
+# Daemon mode: socket2 events that trigger a rename pass, and how bursts/reconnects are paced
+RENAME_EVENTS = {"vdesk"}
+# Focus changes, applied right away instead of waiting out the quiet period after a pass
+URGENT_EVENTS = {"vdesk", "workspacev2", "activespecial"}
+# Quiet period after a pass, doubled up to the max while title changes keep coming
+MIN_PASS_INTERVAL_SECONDS = 0.15
+MAX_PASS_INTERVAL_SECONDS = 1.0
+RECONNECT_DELAY_SECONDS = 0.5
+MAX_RECONNECT_DELAY_SECONDS = 10.0
+# Daemon mode: how often the event-driven client index is replaced by a full clients dump
+RESYNC_SECONDS = 30.0
+
 STATUS_PRIORITY = {
     AGENT_STATUS.WAITING: 1,
     AGENT_STATUS.INPROGRESS: 2,
@@ -30,44 +60,86 @@ STATUS_PRIORITY = {
 
 DEBUG = False
 
+# How names are applied: "reset" rewrites the config and reloads every desk with vdeskreset,
+# "dispatch" (daemon only) renames only the changed desks with RENAME_DISPATCHER and drops back
+# to "reset" for good the first time the plugin rejects it, "waybar" leaves Hyprland alone and
+# streams names and statuses to stdout for a Waybar custom module
+RENAME_MODE = "reset"
+RENAME_DISPATCHER = "vdeskrename"
+# Hash of the names config last written, and the names last dispatched per vdesk
+_written_hash: int | None = None
+_applied_names: dict[int, str] = {}
+
+# Upper bound for the single tmux call per pass; a hung tmux server falls back to the last known statuses
+TMUX_TIMEOUT_SECONDS = 1.0
+_last_tmux_statuses: dict[str, tuple[str, list[str]]] = {}
+# Last status dispatched per vdesk, so unchanged statuses aren't sent again
+_applied_statuses: dict[int, str] = {}
+status_dispatches_avoided = 0
+# Daemon mode: statuses pushed by the tmux control-mode client, used instead of forking tmux
+_pushed_tmux_statuses: dict[str, tuple[str, list[str]]] | None = None
+
+# Bound of each memoized title/session-name transform, the memos live as long as the process
+MEMO_MAX_ENTRIES = 1024
+
 
 def debug(msg: str) -> None:
     if DEBUG:
         print(f"[debug] {msg}", file=sys.stderr)
 
 
-def get_tmux_session_statuses(session_name: str) -> tuple[str, list[str]]:
-    """Get per-window @ai-agent-status and @monitor-status for a tmux session.
+def get_tmux_statuses() -> dict[str, tuple[str, list[str]]]:
+    """Get @ai-agent-status and @monitor-status of every tmux session with a single tmux call.
 
-    Returns a tuple of:
+    Returns a mapping of session name to a tuple of:
       - the aggregated @ai-agent-status (highest priority across windows), and
       - the ordered list of per-window @monitor-status values (empties dropped).
+    If tmux doesn't answer within TMUX_TIMEOUT_SECONDS, the last known statuses are returned.
+    While the tmux control-mode client is connected, its pushed statuses are used instead.
     """
+    global _last_tmux_statuses
+    if _pushed_tmux_statuses is not None:
+        return _pushed_tmux_statuses
     try:
         list_result = subprocess.run(
-            ["tmux", "list-windows", "-t", session_name, "-F",
-             "#{@ai-agent-status}|#{@monitor-status}"],
+            ["tmux", "list-windows", "-a", "-F",
+             "#{session_name}|#{@ai-agent-status}|#{@monitor-status}"],
             capture_output=True,
             text=True,
-            timeout=2,
+            timeout=TMUX_TIMEOUT_SECONDS,
         )
-        agent_statuses: list[str] = []
-        monitor_statuses: list[str] = []
-        for line in list_result.stdout.splitlines():
-            agent, _, monitor = line.partition("|")
-            agent = agent.strip()
-            monitor = monitor.strip()
-            if agent:
-                agent_statuses.append(agent)
-            if monitor:
-                monitor_statuses.append(monitor)
-        debug(f"tmux session {session_name!r} agent={agent_statuses} monitor={monitor_statuses}")
-        agent_winner = highest_priority_status(agent_statuses)
-        debug(f"tmux session {session_name!r} resolved agent status: {agent_winner!r}")
-        return agent_winner, monitor_statuses
-    except (subprocess.TimeoutExpired, Exception) as e:
-        debug(f"tmux session {session_name!r} status lookup failed: {e!r}")
-        return "", []
+    except (subprocess.TimeoutExpired, OSError) as e:
+        debug(f"tmux status lookup failed, using last known statuses: {e!r}")
+        return _last_tmux_statuses
+    _last_tmux_statuses = parse_tmux_statuses(list_result.stdout)
+    return _last_tmux_statuses
+
+
+def parse_tmux_statuses(output: str) -> dict[str, tuple[str, list[str]]]:
+    """Group `#{session_name}|#{@ai-agent-status}|#{@monitor-status}` lines by session."""
+    agent_statuses: dict[str, list[str]] = {}
+    monitor_statuses: dict[str, list[str]] = {}
+    for line in output.splitlines():
+        parts = line.rsplit("|", 2)
+        if len(parts) != 3:
+            continue
+        session_name, agent, monitor = parts
+        agent = agent.strip()
+        monitor = monitor.strip()
+        session_agents = agent_statuses.setdefault(session_name, [])
+        session_monitors = monitor_statuses.setdefault(session_name, [])
+        if agent:
+            session_agents.append(agent)
+        if monitor:
+            session_monitors.append(monitor)
+
+    statuses = {}
+    for session_name, agents in agent_statuses.items():
+        agent_winner = highest_priority_status(agents)
+        debug(f"tmux session {session_name!r} agent={agents} monitor={monitor_statuses[session_name]} "
+              f"-> {agent_winner!r}")
+        statuses[session_name] = (agent_winner, monitor_statuses[session_name])
+    return statuses
 
 
 def highest_priority_status(statuses: list[str]) -> str:
@@ -82,16 +154,25 @@ def highest_priority_status(statuses: list[str]) -> str:
     return best or ""
 
 
-def set_vdesk_statuses(vdesk_statuses: dict[int, list[str]], all_vdesk_ids: set[int]) -> None:
-    """Set vdesk status via hyprctl dispatch vdesksetstatus for each vdesk."""
-    for vdesk_id in all_vdesk_ids:
-        statuses = vdesk_statuses.get(vdesk_id, [])
-        status = highest_priority_status(statuses)
-        debug(f"vdesk {vdesk_id} statuses={statuses} -> {status!r}")
-        subprocess.run(
-            ["hyprctl", "dispatch", "vdesksetstatus", f"{vdesk_id},{status}"],
-            capture_output=True,
-        )
+def set_vdesk_statuses(vdesk_statuses: dict[int, str]) -> None:
+    """Set vdesk status via vdesksetstatus for each vdesk whose status changed since the last pass.
+
+    All changed statuses are dispatched together in one batched IPC request.
+    """
+    global status_dispatches_avoided
+    changed: dict[int, str] = {}
+    for vdesk_id, status in sorted(vdesk_statuses.items()):
+        if _applied_statuses.get(vdesk_id) == status:
+            status_dispatches_avoided += 1
+            continue
+        changed[vdesk_id] = status
+    debug(f"status dispatches: {len(changed)} sent, {status_dispatches_avoided} avoided so far")
+    if not changed:
+        return
+
+    commands = [f"dispatch vdesksetstatus {vdesk_id},{status}" for vdesk_id, status in changed.items()]
+    # Statuses that weren't acknowledged are sent again next pass
+    _applied_statuses.update(item for item, ok in zip(changed.items(), dispatch_batch(commands)) if ok)
 
 
 JIRA_TICKET_RE = re.compile(r"[A-Z]+-\d+")
@@ -115,39 +196,32 @@ def strip_prefix_and_jira(name: str, keep_number: bool = False) -> str:
     return name
 
 
-SEPARATORS = set("-_/. ")
+# Kept across passes in daemon mode, so only sessions that appeared or disappeared are walked
+_prefix_trie = PrefixTrie()
 
 
 def longest_common_prefix(names: list[str]) -> str:
-    """Find the longest separator-terminated prefix shared by at least 2 names.
+    """Find the longest separator-terminated prefix shared by at least 2 names."""
+    _prefix_trie.sync(names)
+    return _prefix_trie.longest_shared_prefix()
 
-    Collects every prefix that ends at a separator character from each name,
-    then returns the longest one that appears in at least 2 names.
-    """
-    if len(names) < 2:
-        return ""
-    prefix_counts: dict[str, int] = {}
-    for name in names:
-        seen: set[str] = set()
-        for i, ch in enumerate(name):
-            if ch in SEPARATORS:
-                prefix = name[: i + 1]
-                if prefix not in seen:
-                    seen.add(prefix)
-                    prefix_counts[prefix] = prefix_counts.get(prefix, 0) + 1
-    best = ""
-    for prefix, count in prefix_counts.items():
-        if count >= 2 and len(prefix) > len(best):
-            best = prefix
-    return best
+
+TITLE_STRIP_CHARS = EMOJI_CHARS | {"「", "」"}
 
 
 def clean_title(title: str) -> str:
     """Remove emojis, collapse whitespace, and strip leading/trailing spaces."""
-    title = EMOJI_RE.sub("", title)
-    title = title.replace("「", "").replace("」", "")
-    title = re.sub(r"\s+", " ", title)
-    return title.strip()
+    if not title.isascii():
+        # Set intersection finds the few distinct characters to delete in one C-level scan
+        for char in TITLE_STRIP_CHARS.intersection(title):
+            title = title.replace(char, "")
+    # split() drops leading/trailing whitespace and runs of it in the same scan
+    return " ".join(title.split())
+
+
+cached_clean_title = LRUMemo(clean_title, MEMO_MAX_ENTRIES)
+cached_strip_prefix_and_jira = LRUMemo(strip_prefix_and_jira, MEMO_MAX_ENTRIES)
+MEMOS = {"clean_title": cached_clean_title, "strip_prefix_and_jira": cached_strip_prefix_and_jira}
 
 
 def run_hyprctl(args: list[str]) -> str:
@@ -160,29 +234,69 @@ def run_hyprctl(args: list[str]) -> str:
     return result.stdout
 
 
-def get_vdesks() -> list[dict]:
+def dispatch_batch(commands: list[str]) -> list[bool]:
+    """Send dispatch commands in one batched IPC request and return whether each replied "ok".
+
+    Falls back to one hyprctl fork per command if the socket is unavailable. A batch reply
+    that can't be split counts as a failure of every command.
+    """
+    try:
+        replies = hypr_ipc.batch(commands)
+    except OSError as e:
+        debug(f"IPC batch failed, falling back to hyprctl: {e!r}")
+        replies = [run_hyprctl(command.split(" ", 2)) for command in commands]
+    except ValueError as e:
+        debug(f"unexpected dispatch batch reply: {e!r}")
+        return [False] * len(commands)
+    for command, reply in zip(commands, replies):
+        if reply.strip() != "ok":
+            debug(f"{command!r} failed: {reply.strip()!r}")
+    return [reply.strip() == "ok" for reply in replies]
+
+
+# Queries that make up one snapshot of the session, fetched together in a single IPC batch
+SNAPSHOT_QUERIES = ["printstate", "clients", "printpinnedwindows", "activeworkspace"]
+# Queries still needed between resyncs when clients come from a ClientIndex
+MODEL_SNAPSHOT_QUERIES = ["printstate", "printpinnedwindows"]
+
+
+def fetch_snapshot(queries: list[str] = SNAPSHOT_QUERIES) -> dict[str, str]:
+    """Fetch the JSON output of all queries in one round trip.
+
+    Talks to the Hyprland socket directly, falling back to one hyprctl fork per query
+    if the socket is unavailable or the batch reply can't be split.
+    """
+    try:
+        replies = hypr_ipc.batch([f"j/{query}" for query in queries])
+        return dict(zip(queries, replies))
+    except (OSError, ValueError) as e:
+        debug(f"IPC batch failed, falling back to hyprctl: {e!r}")
+        return {query: run_hyprctl([query, "-j"]) for query in queries}
+
+
+def get_vdesks(snapshot: dict[str, str]) -> list[Vdesk]:
     """Get all virtual desktops from hyprctl printstate."""
-    output = run_hyprctl(["printstate", "-j"])
+    output = snapshot["printstate"]
     try:
-        return json.loads(output)
+        return [vdesk_from_json(vdesk) for vdesk in json.loads(output)]
     except json.JSONDecodeError:
         print(f"Error parsing vdesks JSON: {output}", file=sys.stderr)
         return []
 
 
-def get_clients() -> list[dict]:
+def get_clients(snapshot: dict[str, str]) -> list[Client]:
     """Get all clients from hyprctl clients."""
-    output = run_hyprctl(["clients", "-j"])
+    output = snapshot["clients"]
     try:
-        return json.loads(output)
+        return clients_from_text(output)
     except json.JSONDecodeError:
         print(f"Error parsing clients JSON: {output}", file=sys.stderr)
         return []
 
 
-def get_pinned_classes() -> set[str]:
+def get_pinned_classes(snapshot: dict[str, str]) -> set[str]:
     """Get the set of window classes that are currently pinned."""
-    output = run_hyprctl(["printpinnedwindows", "-j"])
+    output = snapshot["printpinnedwindows"]
     try:
         windows = json.loads(output)
         return {w.get("class", "").lower() for w in windows}
@@ -190,135 +304,197 @@ def get_pinned_classes() -> set[str]:
         return set()
 
 
-def get_active_vdesk_id(workspace_to_vdesk: dict) -> int | None:
-    """Get the vdesk ID of the currently active workspace."""
-    output = run_hyprctl(["activeworkspace", "-j"])
+def get_active_workspace(snapshot: dict[str, str]) -> Workspace:
+    """Get the currently active workspace."""
+    output = snapshot["activeworkspace"]
     try:
         ws = json.loads(output)
-        ws_id = ws.get("id")
-        vdesk = workspace_to_vdesk.get(ws_id)
-        return vdesk.get("id") if vdesk else None
-    except (json.JSONDecodeError, AttributeError):
-        return None
+    except json.JSONDecodeError:
+        ws = None
+    return workspace_from_json(ws if isinstance(ws, dict) else {})
 
 
 def write_names(names: dict[int, str]) -> None:
-    """Write vdesk names to config file if changed."""
+    """Write vdesk names to config file if changed and apply them.
+
+    In "reset" mode the plugin reloads all names with vdeskreset. In "dispatch" mode only
+    the changed names are sent with RENAME_DISPATCHER, and the config file is kept for
+    persistence, and for the vdeskreset fallback when some of them fail.
+    """
+    global _written_hash
     # Build the names string: "1:name1, 2:name2, ..."
     names_str = ", ".join(f"{id}:{name}" for id, name in sorted(names.items()))
-    
+
     content = f"""plugin {{
     virtual-desktops {{
         names = {names_str}
     }}
 }}
 """
-    # Read current content and compare
-    try:
-        with open(CONFIG_LOC, "r") as f:
-            if f.read() == content:
-                return
-    except FileNotFoundError:
-        pass
-    
-    with open(CONFIG_LOC, "w") as f:
-        f.write(content)
-    
-    # Reload workspace names
-    subprocess.run(["hyprctl", "dispatch", "vdeskreset"], capture_output=True)
+    # Compare against what was last written, the file is only read on the first pass
+    if _written_hash is None:
+        try:
+            with open(CONFIG_LOC, "r") as f:
+                _written_hash = hash(f.read())
+        except FileNotFoundError:
+            pass
+    content_changed = hash(content) != _written_hash
+
+    reset = content_changed
+    if RENAME_MODE == "dispatch":
+        reset = not dispatch_names(names)
+    elif not content_changed:
+        return
 
+    if content_changed:
+        # Write to a temp file and rename, so Hyprland never sources a half-written config
+        tmp_path = f"{CONFIG_LOC}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, CONFIG_LOC)
+        _written_hash = hash(content)
 
-def main():
-    global DEBUG
-    parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("--debug", action="store_true", help="Print debug logs for status resolution")
-    args = parser.parse_args()
-    DEBUG = args.debug
+    if reset:
+        # Reload workspace names
+        if dispatch_batch(["dispatch vdeskreset"])[0]:
+            _applied_names.update(names)
 
-    vdesks = get_vdesks()
-    clients = get_clients()
 
-    if not vdesks:
-        print("No virtual desktops found", file=sys.stderr)
-        return
+def dispatch_names(names: dict[int, str]) -> bool:
+    """Rename only the vdesks whose name changed since the last pass, in one batched IPC request.
 
-    # Build a mapping of workspace ID -> vdesk
-    workspace_to_vdesk = {}
-    for vdesk in vdesks:
-        for ws_id in vdesk.get("workspaces", []):
-            workspace_to_vdesk[ws_id] = vdesk
-
-    # Aggregate all renames into a dict
-    renames: dict[int, str] = {}
-    tmux_suffix = " - TMUX"
-    browser_classes = {"firefox", "firefox_firefox", "chromium", "google-chrome", "brave-browser", "vivaldi", "zen", "zen-browser"}
-    slack_classes = {"slack"}
-
-    # Build a mapping of vdesk ID -> list of clients on that vdesk
-    vdesk_clients: dict[int, list[dict]] = {}
-    for client in clients:
-        workspace = client.get("workspace", {})
-        ws_id = workspace.get("id")
-        if ws_id is None:
-            continue
-        vdesk = workspace_to_vdesk.get(ws_id)
-        if vdesk is None:
-            continue
-        vdesk_id = vdesk.get("id")
-        vdesk_clients.setdefault(vdesk_id, []).append(client)
-
-    active_vdesk_id = get_active_vdesk_id(workspace_to_vdesk)
-
-    # Collect TMUX session (agent_icon, monitor_icons, raw_name) per vdesk (separate viewer sessions)
-    tmux_names: dict[int, list[tuple[str, str, str]]] = {}
-    tmux_viewer_names: dict[int, list[tuple[str, str, str]]] = {}
-    vdesk_statuses: dict[int, list[str]] = {}
-    for client in clients:
-        title = client.get("title", "")
-        if not title.endswith(tmux_suffix):
-            continue
+    Returns False if some names weren't applied and the caller should vdeskreset instead.
+    """
+    global RENAME_MODE
+    changed = {vdesk_id: name for vdesk_id, name in names.items() if _applied_names.get(vdesk_id) != name}
+    debug(f"renaming vdesks {sorted(changed)}")
+    if not changed:
+        return True
+    # ';' separates the commands of a batch
+    commands = [f"dispatch {RENAME_DISPATCHER} {vdesk_id},{name.replace(';', '')}"
+                for vdesk_id, name in sorted(changed.items())]
+    results = dispatch_batch(commands)
+    _applied_names.update(item for item, ok in zip(sorted(changed.items()), results) if ok)
+    if all(results):
+        return True
+    if not any(results):
+        # The plugin doesn't know the dispatcher (virtual-desktops forks without vdeskrename),
+        # so stop paying a rejected batch on top of every vdeskreset
+        print(f"{RENAME_DISPATCHER} rejected by the virtual-desktops plugin, "
+              "using --rename-mode reset from now on", file=sys.stderr)
+        RENAME_MODE = "reset"
+    return False
+
+
+@dataclass
+class Snapshot:
+    """Everything the naming logic reads from one moment of the session."""
+    vdesks: list[Vdesk]
+    clients: list[Client]
+    pinned_classes: set[str]
+    active_workspace_id: int | None
+    tmux_statuses: dict[str, tuple[str, list[str]]]
+
+
+@dataclass
+class Renames:
+    """Output of compute_renames."""
+    names: dict[int, str]
+    # Highest priority tmux status per vdesk ("" for none)
+    statuses: dict[int, str]
+    # (fingerprint, name) per vdesk, passed back to the next compute_renames to skip unchanged desks
+    rendered: dict[int, tuple[tuple, str]]
+    # Vdesks whose fingerprint changed and were rendered again
+    rerendered: list[int]
+
+
+@dataclass
+class VdeskFlags:
+    """What a single pass over the clients learns about one vdesk."""
+    first_client: Client | None = None
+    first_browser: Client | None = None
+    has_browser: bool = False
+    has_slack: bool = False
+    only_slack: bool = True
+    # (agent_icon, monitor_icons, raw_name) per TMUX client, viewer sessions kept apart
+    tmux: list[tuple[str, str, str]] = field(default_factory=list)
+    viewer: list[tuple[str, str, str]] = field(default_factory=list)
+    statuses: list[str] = field(default_factory=list)
+
+    def icons_prefix(self) -> str:
+        icons = []
+        if self.has_slack:
+            icons.append(SLACK_ICON)
+        if self.has_browser:
+            icons.append(BROWSER_ICON)
+        return " ".join(icons) + " " if icons else ""
 
-        # Get the workspace this client is on
-        workspace = client.get("workspace", {})
-        ws_id = workspace.get("id")
-        if ws_id is None:
-            continue
 
-        # Find the vdesk for this workspace
-        vdesk = workspace_to_vdesk.get(ws_id)
-        if vdesk is None:
-            continue
+def workspace_vdesk_ids(vdesks: list[Vdesk]) -> dict[int, int]:
+    """Map every workspace ID to the ID of the vdesk it belongs to."""
+    return {ws_id: vdesk.id for vdesk in vdesks for ws_id in vdesk.workspaces}
+
 
-        vdesk_id = vdesk.get("id")
-        name = clean_title(title[:-len(tmux_suffix)])
+def compute_renames(snapshot: Snapshot, rendered: dict[int, tuple[tuple, str]] | None = None) -> Renames:
+    """Compute the name and status of every vdesk from a snapshot. Pure, no IPC.
 
-        # Get statuses for this tmux session
-        agent_status, monitor_statuses = get_tmux_session_statuses(name)
+    Vdesks with TMUX clients are named after their tmux sessions, others after the title
+    of one of their windows (browsers preferred), empty ones after their ID only.
+    rendered is Renames.rendered of a previous call: a vdesk whose fingerprint (everything
+    its name is rendered from) is unchanged keeps its name without being rendered again.
+    """
+    workspace_to_vdesk_id = workspace_vdesk_ids(snapshot.vdesks)
+    active_vdesk_id = workspace_to_vdesk_id.get(snapshot.active_workspace_id)
+    unpinned_slack_classes = SLACK_CLASSES - snapshot.pinned_classes
+
+    # Classify every client once into per-vdesk flags
+    flags: dict[int, VdeskFlags] = {vdesk.id: VdeskFlags() for vdesk in snapshot.vdesks}
+    for client in snapshot.clients:
+        vdesk_id = workspace_to_vdesk_id.get(client.workspace_id)
+        if vdesk_id is None:
+            continue
+        desk = flags[vdesk_id]
+        cls = client.cls.lower()
+        if desk.first_client is None:
+            desk.first_client = client
+        if cls in BROWSER_CLASSES:
+            desk.has_browser = True
+            if desk.first_browser is None:
+                desk.first_browser = client
+        if cls in unpinned_slack_classes:
+            desk.has_slack = True
+        if cls not in SLACK_CLASSES:
+            desk.only_slack = False
+
+        title = client.title
+        if not title.endswith(TMUX_SUFFIX):
+            continue
+        name = cached_clean_title(title[:-len(TMUX_SUFFIX)])
+
+        agent_status, monitor_statuses = snapshot.tmux_statuses.get(name, ("", []))
         if agent_status:
             debug(f"vdesk {vdesk_id} tmux {name!r} contributes agent status {agent_status!r}")
-            vdesk_statuses.setdefault(vdesk_id, []).append(agent_status)
+            desk.statuses.append(agent_status)
         for ms in monitor_statuses:
             debug(f"vdesk {vdesk_id} tmux {name!r} contributes monitor status {ms!r}")
-            vdesk_statuses.setdefault(vdesk_id, []).append(ms)
+            desk.statuses.append(ms)
 
         agent_icon = AGENT_STATUS_ICONS.get(agent_status, TMUX_ICON)
         monitor_icons = "".join(
             MONITOR_STATUS_ICONS[s] for s in monitor_statuses if s in MONITOR_STATUS_ICONS
         )
 
-        name = strip_prefix_and_jira(name, keep_number=vdesk_id == active_vdesk_id)
+        name = cached_strip_prefix_and_jira(name, vdesk_id == active_vdesk_id)
 
         if name.endswith("-viewer"):
-            tmux_viewer_names.setdefault(vdesk_id, []).append((agent_icon, monitor_icons, name))
+            desk.viewer.append((agent_icon, monitor_icons, name))
         else:
-            tmux_names.setdefault(vdesk_id, []).append((agent_icon, monitor_icons, name))
+            desk.tmux.append((agent_icon, monitor_icons, name))
 
     # Compute common prefix across all TMUX session names for shortening
-    all_raw_names = [name for entries in tmux_names.values() for _, _, name in entries]
-    all_raw_names += [name for entries in tmux_viewer_names.values() for _, _, name in entries]
-    prefix = longest_common_prefix(all_raw_names)
-
-    pinned_classes = get_pinned_classes()
+    prefix = longest_common_prefix(
+        [name for desk in flags.values() for entries in (desk.tmux, desk.viewer) for _, _, name in entries]
+    )
 
     def format_tmux_entry(agent_icon: str, monitor_icons: str, raw_name: str, use_full: bool) -> str:
         if use_full or not raw_name.startswith(prefix):
@@ -331,95 +507,350 @@ def main():
             display = display[:MAX_NAME_LENGTH] + "…"
         return display
 
-    # Build renames for vdesks with TMUX clients
-    all_tmux_vdesks = set(tmux_names.keys()) | set(tmux_viewer_names.keys())
-    for vdesk_id in all_tmux_vdesks:
-        entries = tmux_names.get(vdesk_id, [])
-        viewer_entries = tmux_viewer_names.get(vdesk_id, [])
-        is_active = vdesk_id == active_vdesk_id
-
-        has_browser = any(
-            c.get("class", "").lower() in browser_classes
-            for c in vdesk_clients.get(vdesk_id, [])
-        )
-        has_slack = any(
-            c.get("class", "").lower() in slack_classes - pinned_classes
-            for c in vdesk_clients.get(vdesk_id, [])
-        )
-        icons = []
-        if has_slack:
-            icons.append(SLACK_ICON)
-        if has_browser:
-            icons.append(BROWSER_ICON)
-        icons_prefix = " ".join(icons) + " " if icons else ""
+    result = Renames(names={}, statuses={}, rendered={}, rerendered=[])
+    for vdesk_id, desk in flags.items():
+        result.statuses[vdesk_id] = highest_priority_status(desk.statuses)
+        debug(f"vdesk {vdesk_id} statuses={desk.statuses} -> {result.statuses[vdesk_id]!r}")
 
+        entries = desk.tmux or desk.viewer
+        icon_flags = (desk.has_slack, desk.has_browser)
         if entries:
+            # The shared prefix only shortens TMUX names, so it only invalidates TMUX desks
+            is_active = vdesk_id == active_vdesk_id
+            fingerprint = (icon_flags, tuple(entries), is_active, prefix)
+        else:
+            chosen = desk.first_browser or desk.first_client
+            fingerprint = (icon_flags, desk.only_slack, chosen.title if chosen else None)
+
+        cached = rendered.get(vdesk_id) if rendered is not None else None
+        if cached is not None and cached[0] == fingerprint:
+            name = cached[1]
+        elif entries:
             formatted = [format_tmux_entry(a, m, name, is_active) for a, m, name in entries]
-            renames[vdesk_id] = f"{vdesk_id} {icons_prefix}{'|'.join(formatted)}"
-        elif viewer_entries:
-            formatted = [format_tmux_entry(a, m, name, is_active) for a, m, name in viewer_entries]
-            renames[vdesk_id] = f"{vdesk_id} {icons_prefix}{'|'.join(formatted)}"
+            name = f"{vdesk_id} {desk.icons_prefix()}{'|'.join(formatted)}"
+            result.rerendered.append(vdesk_id)
+        else:
+            name = name_title_vdesk(vdesk_id, desk)
+            result.rerendered.append(vdesk_id)
+        result.names[vdesk_id] = name
+        result.rendered[vdesk_id] = (fingerprint, name)
+    return result
+
+
+def name_title_vdesk(vdesk_id: int, desk: VdeskFlags) -> str:
+    """Name a vdesk without TMUX clients after the title of one of its windows (browsers preferred)."""
+    # Pick best client: prioritize browsers, then fall back to first client
+    chosen = desk.first_browser or desk.first_client
+    if chosen is None:
+        return f"{vdesk_id}"
+
+    title = cached_clean_title(chosen.title)
+    if not title:
+        return f"{vdesk_id}"
+
+    if desk.has_slack and not desk.has_browser and desk.only_slack:
+        return f"{vdesk_id} {SLACK_ICON} Slack"
+
+    if len(title) > MAX_NAME_LENGTH:
+        title = title[:MAX_NAME_LENGTH] + "…"
+    return f"{vdesk_id} {desk.icons_prefix()}{title}"
 
-    # For vdesks without TMUX clients, try to use a window title (prefer browsers)
+
+def waybar_line(vdesks: list[Vdesk], renames: Renames) -> str:
+    """Render one Waybar custom module update (return-type json) for all vdesks.
+
+    text holds the names of populated or focused vdesks, the focused one in bold, and class
+    the statuses present so the bar can style on them. vdesks carries the per-desk name,
+    status and status icon for bars that want to lay them out themselves.
+    """
+    desks = []
     for vdesk in vdesks:
-        vdesk_id = vdesk.get("id")
-        if vdesk_id in renames:
+        vdesk_id = vdesk.id
+        if vdesk_id not in renames.names or not (vdesk.populated or vdesk.focused):
             continue
+        status = renames.statuses.get(vdesk_id, "")
+        desks.append({
+            "id": vdesk_id,
+            "name": renames.names[vdesk_id],
+            "status": status,
+            "icon": AGENT_STATUS_ICONS.get(status, ""),
+            "focused": vdesk.focused,
+        })
+    # Waybar parses text and tooltip as Pango markup
+    labels = [f"<b>{html.escape(d['name'])}</b>" if d["focused"] else html.escape(d["name"]) for d in desks]
+    tooltip = "\n".join(f"{html.escape(d['name'])} {d['status']}".rstrip() for d in desks)
+    focused = next((d["name"] for d in desks if d["focused"]), "")
+    classes = sorted({d["status"].lower() for d in desks if d["status"]})
+    return json.dumps({"text": "  ".join(labels), "alt": focused, "tooltip": tooltip,
+                       "class": classes, "vdesks": desks}, ensure_ascii=False)
+
+
+_last_waybar_line: str | None = None
+
+
+def write_waybar(vdesks: list[Vdesk], renames: Renames) -> None:
+    """Print a Waybar update line, only if it differs from the last one."""
+    global _last_waybar_line
+    line = waybar_line(vdesks, renames)
+    if line == _last_waybar_line:
+        return
+    print(line, flush=True)
+    _last_waybar_line = line
 
-        desk_clients = vdesk_clients.get(vdesk_id, [])
-        if not desk_clients:
-            renames[vdesk_id] = f"{vdesk_id}"
-            continue
 
-        # Pick best client: prioritize browsers, then fall back to first client
-        chosen = None
-        for c in desk_clients:
-            cls = c.get("class", "").lower()
-            if cls in browser_classes:
-                chosen = c
-                break
-        if chosen is None:
-            chosen = desk_clients[0]
-
-        title = clean_title(chosen.get("title", ""))
-        if not title:
-            renames[vdesk_id] = f"{vdesk_id}"
-            continue
+# Per-phase timings, exported when --metrics-log or --metrics-prom is given
+METRICS = PassMetrics()
 
-        has_browser = any(
-            c.get("class", "").lower() in browser_classes
-            for c in desk_clients
-        )
-        has_slack = any(
-            c.get("class", "").lower() in slack_classes - pinned_classes
-            for c in desk_clients
-        )
+# Daemon mode: fingerprint and name of every vdesk from the last pass, see compute_renames
+_rendered: dict[int, tuple[tuple, str]] = {}
 
-        only_slack = has_slack and not has_browser and all(
-            c.get("class", "").lower() in slack_classes
-            for c in desk_clients
-        )
-        if only_slack:
-            renames[vdesk_id] = f"{vdesk_id} {SLACK_ICON} Slack"
-            continue
 
-        icons = []
-        if has_slack:
-            icons.append(SLACK_ICON)
-        if has_browser:
-            icons.append(BROWSER_ICON)
-        icons_prefix = " ".join(icons) + " " if icons else ""
+def rename_pass(index: ClientIndex | None = None, counters: dict[str, int] | None = None) -> None:
+    """Fetch a snapshot of the session and rename all vdesks once.
 
-        if len(title) > MAX_NAME_LENGTH:
-            title = title[:MAX_NAME_LENGTH] + "…"
-        renames[vdesk_id] = f"{vdesk_id} {icons_prefix}{title}"
+    With an index (daemon mode), clients come from the event-driven model and a full
+    clients dump is only fetched to resync it. Only vdesks whose inputs changed since
+    the previous pass are rendered again. counters are added to the exported metrics.
+    """
+    global _rendered
+    METRICS.start_pass()
+    with METRICS.span("snapshot"):
+        if index is None:
+            raw = fetch_snapshot()
+            clients = get_clients(raw)
+            active_workspace_id = get_active_workspace(raw).id
+        else:
+            resync = index.stale(RESYNC_SECONDS)
+            raw = fetch_snapshot(SNAPSHOT_QUERIES if resync else MODEL_SNAPSHOT_QUERIES)
+            if resync:
+                debug("resyncing client index")
+                index.resync(get_clients(raw), get_active_workspace(raw))
+            clients, active_workspace_id = index.view()
+        vdesks = get_vdesks(raw)
+        pinned_classes = get_pinned_classes(raw)
+
+    if not vdesks:
+        print("No virtual desktops found", file=sys.stderr)
+        return
+
+    with METRICS.span("tmux"):
+        # All tmux sessions are fetched at once, and only if there is a TMUX client
+        has_tmux = any(c.title.endswith(TMUX_SUFFIX) for c in clients)
+        tmux_statuses = get_tmux_statuses() if has_tmux else {}
+    snapshot = Snapshot(vdesks, clients, pinned_classes, active_workspace_id, tmux_statuses)
+
+    with METRICS.span("compute"):
+        result = compute_renames(snapshot, _rendered)
+    _rendered = result.rendered
+    debug(f"rendered vdesks: {result.rerendered}")
+
+    if RENAME_MODE == "waybar":
+        with METRICS.span("waybar"):
+            write_waybar(vdesks, result)
+    else:
+        # Set vdesk statuses (highest priority tmux session status per vdesk)
+        with METRICS.span("status_dispatch"):
+            set_vdesk_statuses(result.statuses)
+
+        # Write names (only if changed)
+        with METRICS.span("write_names"):
+            write_names(result.names)
+
+    if DEBUG:
+        debug("phases: " + ", ".join(f"{phase}={seconds * 1000:.2f}ms" for phase, seconds in METRICS.phases.items()))
+        debug("memo: " + ", ".join(f"{name} {memo.stats()}" for name, memo in MEMOS.items()))
+    if METRICS.enabled:
+        METRICS.finish_pass(dict(counters or {}, status_dispatches_avoided_total=status_dispatches_avoided))
+
+
+class Debouncer:
+    """Coalesce bursts of triggers into as few rename passes as possible.
+
+    The first trigger runs the action immediately (leading edge). Triggers arriving while
+    it runs or during the following quiet period are folded into a single extra run once
+    the period is over (trailing edge), so the last event of a burst is never lost.
+    The quiet period starts at min_interval and doubles, up to max_interval, while
+    triggers keep arriving, then resets once a period passes without any. Urgent
+    triggers (focus changes) cut the quiet period short and run as soon as the current
+    pass is done.
+    """
+
+    def __init__(self, action: Callable[[], Awaitable[None]], min_interval: float, max_interval: float):
+        import asyncio
+
+        self._action = action
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.interval = min_interval
+        self._task: asyncio.Task | None = None
+        self._pending = False
+        self._urgent = asyncio.Event()
+        self.triggers = 0
+        self.urgent_triggers = 0
+        self.passes = 0
+
+    def trigger(self, urgent: bool = False) -> None:
+        import asyncio
+
+        self.triggers += 1
+        if urgent:
+            self.urgent_triggers += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            return
+        self._pending = True
+        if urgent:
+            self._urgent.set()
+
+    def stats(self) -> dict[str, int]:
+        """Trigger counters, for the metrics exports."""
+        return {
+            "triggers_total": self.triggers,
+            "urgent_triggers_total": self.urgent_triggers,
+            # Triggers folded into another trigger's pass instead of getting their own
+            "triggers_coalesced_total": self.triggers - self.passes,
+        }
+
+    async def wait_idle(self) -> None:
+        """Wait until the current run, including its trailing edge, is over."""
+        while self._task is not None and not self._task.done():
+            await self._task
+
+    async def _run(self) -> None:
+        import asyncio
+
+        self.interval = self.min_interval
+        while True:
+            self._pending = False
+            self._urgent.clear()
+            self.passes += 1
+            try:
+                await self._action()
+            except Exception as e:
+                print(f"Rename pass failed: {e!r}", file=sys.stderr)
+            if not self._urgent.is_set():
+                try:
+                    await asyncio.wait_for(self._urgent.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+            if not self._pending:
+                debug(f"debouncer: {self.triggers} triggers ({self.urgent_triggers} urgent) -> {self.passes} passes")
+                return
+            if not self._urgent.is_set():
+                # Still churning after a full quiet period, back off
+                self.interval = min(self.interval * 2, self.max_interval)
+
+
+def handle_event(line: str, debouncer: Debouncer, index: ClientIndex) -> None:
+    """Feed one socket2 line to the client index, triggering a rename on RENAME_EVENTS
+    or whenever the index changed. Focus changes (URGENT_EVENTS) skip the queue."""
+    event, _, data = line.partition(">>")
+    if event in RENAME_EVENTS or (event in MODEL_EVENTS and index.apply(event, data)):
+        debouncer.trigger(urgent=event in URGENT_EVENTS)
 
-    # Set vdesk statuses (highest priority tmux session status per vdesk)
-    all_vdesk_ids = {vdesk.get("id") for vdesk in vdesks}
-    set_vdesk_statuses(vdesk_statuses, all_vdesk_ids)
 
-    # Write names (only if changed)
-    write_names(renames)
+async def listen_events(debouncer: Debouncer, index: ClientIndex) -> None:
+    """Read socket2 events forever and pass them to handle_event.
+
+    Reconnects when Hyprland closes the socket and exits once the instance is gone.
+    """
+    import asyncio
+
+    reconnect_delay = RECONNECT_DELAY_SECONDS
+    while True:
+        try:
+            reader, writer = await asyncio.open_unix_connection(hypr_ipc.event_socket_path())
+        except OSError as e:
+            if not os.path.isdir(hypr_ipc.socket_dir()):
+                print(f"Hyprland instance is gone ({e}), exiting", file=sys.stderr)
+                return
+            debug(f"socket2 connect failed: {e!r}, retrying in {reconnect_delay}s")
+            await asyncio.sleep(reconnect_delay)
+            reconnect_delay = min(reconnect_delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+            continue
+
+        reconnect_delay = RECONNECT_DELAY_SECONDS
+        # Events may have been missed while disconnected
+        index.needs_resync = True
+        debouncer.trigger()
+        try:
+            while line := await reader.readline():
+                handle_event(line.decode(errors="replace").rstrip("\n"), debouncer, index)
+        except (OSError, ValueError) as e:
+            debug(f"socket2 read failed: {e!r}")
+        finally:
+            writer.close()
+        print("Hyprland event socket closed, reconnecting", file=sys.stderr)
+        await asyncio.sleep(reconnect_delay)
+
+
+async def run_daemon() -> None:
+    import asyncio
+    import tmux_control
+
+    loop = asyncio.get_running_loop()
+    index = ClientIndex()
+    # rename_pass blocks on subprocesses, keep it off the event loop so events keep flowing
+    debouncer = Debouncer(lambda: loop.run_in_executor(None, rename_pass, index, debouncer.stats()),
+                          MIN_PASS_INTERVAL_SECONDS, MAX_PASS_INTERVAL_SECONDS)
+
+    def on_tmux_statuses(output: str) -> None:
+        global _pushed_tmux_statuses
+        statuses = parse_tmux_statuses(output)
+        if statuses != _pushed_tmux_statuses:
+            debug("tmux statuses changed")
+            _pushed_tmux_statuses = statuses
+            debouncer.trigger()
+
+    def on_tmux_disconnect() -> None:
+        global _pushed_tmux_statuses
+        # Fall back to harvesting statuses with a tmux fork per pass
+        _pushed_tmux_statuses = None
+
+    tmux_task = asyncio.create_task(tmux_control.watch_statuses(on_tmux_statuses, on_tmux_disconnect))
+    try:
+        await listen_events(debouncer, index)
+    finally:
+        tmux_task.cancel()
+
+
+def main():
+    global DEBUG, RENAME_MODE, MIN_PASS_INTERVAL_SECONDS, MAX_PASS_INTERVAL_SECONDS
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--debug", action="store_true", help="Print debug logs for status resolution")
+    parser.add_argument("--rename-mode", choices=["reset", "dispatch", "waybar"], default=RENAME_MODE,
+                        help="Apply names by reloading all desks (vdeskreset), by renaming only changed desks "
+                             "(daemon only, needs the plugin's vdeskrename), "
+                             "or stream them as Waybar custom module JSON on stdout")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Stay running and rename on Hyprland events instead of renaming once")
+    parser.add_argument("--min-interval", type=float, default=MIN_PASS_INTERVAL_SECONDS, metavar="SECONDS",
+                        help="Daemon mode: quiet period after a rename pass, triggers during it are batched")
+    parser.add_argument("--max-interval", type=float, default=MAX_PASS_INTERVAL_SECONDS, metavar="SECONDS",
+                        help="Daemon mode: longest quiet period the interval backs off to under constant churn")
+    parser.add_argument("--metrics-log", metavar="PATH", help="Append per-phase pass timings to a JSON-lines file")
+    parser.add_argument("--metrics-prom", metavar="PATH",
+                        help="Export pass timing histograms to a Prometheus textfile-collector .prom file")
+    args = parser.parse_args()
+    if args.rename_mode == "dispatch" and not args.daemon:
+        # A one-shot run has no applied names to diff against, it would dispatch every name
+        parser.error("--rename-mode dispatch needs --daemon")
+    DEBUG = args.debug
+    RENAME_MODE = args.rename_mode
+    MIN_PASS_INTERVAL_SECONDS = args.min_interval
+    MAX_PASS_INTERVAL_SECONDS = args.max_interval
+    METRICS.log_path = args.metrics_log
+    METRICS.prom_path = args.metrics_prom
+
+    if args.daemon:
+        import asyncio
+
+        try:
+            asyncio.run(run_daemon())
+        except KeyboardInterrupt:
+            pass
+    else:
+        rename_pass()
 
 
 if __name__ == "__main__":
@@ -5,27 +5,28 @@
 
 from __future__ import annotations
 
+# A run answered from a fresh cache only needs the imports below. html, threading/queue and
+# requests (with urllib3, ssl, ...) are imported where a cache miss first needs them; see
+# debug/check_weather_imports.py for the budget this is held to.
 import json
 import os
 import sys
 import time
-import html
-from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, TypeVar, Union, cast
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union, cast
 from typing import NamedTuple
-import requests
 
-from dataclasses import dataclass
+if TYPE_CHECKING:
+    import queue
+    import requests
 
-@dataclass
-class Location:
+
+class Location(NamedTuple):
     lat: float
     lon: float
     place: Optional[str] = None
 
 
-@dataclass
-class WeatherData:
+class WeatherData(NamedTuple):
     temp_str: str
     feels_str: str
     icon: str
@@ -54,10 +55,22 @@ class WeatherData:
 #   export WEATHER_TOOLTIP_MARKUP=1   # 1 to enable Pango markup, 0 to disable
 #   export WEATHER_LOC_ICON="📍"      # or "*" for ASCII-only
 #
-CACHE_DIR: Path = Path.home() / ".cache"
-API_CACHE_PATH: Path = CACHE_DIR / "open_meteo_cache.json"
-SIMPLE_TEXT_CACHE_PATH: Path = CACHE_DIR / ".weather_cache"
+CACHE_DIR: str = os.path.join(os.path.expanduser("~"), ".cache")
+API_CACHE_PATH: str = os.path.join(CACHE_DIR, "open_meteo_cache.json")
+SIMPLE_TEXT_CACHE_PATH: str = os.path.join(CACHE_DIR, ".weather_cache")
 CACHE_TTL_SECONDS = int(os.getenv("WEATHER_CACHE_TTL", "300"))  # default 5 minutes
+# IP geolocation result, reused until the network fingerprint changes or the TTL expires
+LOCATION_CACHE_PATH: str = os.path.join(CACHE_DIR, "weather_location.json")
+LOCATION_TTL_SECONDS = int(os.getenv("WEATHER_LOCATION_TTL", "86400"))  # default 1 day
+# Success rate and latency of each IP geolocation provider, to rank them for the next lookup
+GEOIP_STATS_PATH: str = os.path.join(CACHE_DIR, "weather_geoip_stats.json")
+# Forward (place name -> coordinates) and reverse (coordinates -> place name) geocoding results.
+# Failed lookups are remembered for the shorter negative TTL; network errors are not cached.
+GEOCODE_CACHE_PATH: str = os.path.join(CACHE_DIR, "weather_geocode.json")
+GEOCODE_TTL_SECONDS = int(os.getenv("WEATHER_GEOCODE_TTL", str(30 * 86400)))  # default 30 days
+GEOCODE_NEGATIVE_TTL_SECONDS = 86400  # 1 day
+# Reverse lookups are keyed by coordinates rounded to this many decimals (~1 km cells)
+GEOCODE_CELL_DECIMALS = 2
 
 # Units: metric or imperial (default metric)
 UNITS = os.getenv("WEATHER_UNITS", "metric").strip().lower()  # metric|imperial
@@ -85,9 +98,36 @@ UA = (
     "(KHTML, like Gecko) Chrome/128.0 Safari/537.36"
 )
 TIMEOUT = 8
+# A cache miss fetches forecast, AQI and place concurrently. The whole fetch gives up after
+# FETCH_DEADLINE seconds, and once the forecast is in, the optional AQI and place get at most
+# OPTIONAL_GRACE more seconds before they are left out of this run's output. Once that is
+# printed, they still get until FETCH_DEADLINE to finish, so their results reach the caches.
+FETCH_DEADLINE = float(os.getenv("WEATHER_FETCH_DEADLINE", "10"))
+OPTIONAL_GRACE = float(os.getenv("WEATHER_OPTIONAL_GRACE", "1.5"))
+# IP geolocation providers race each other. The best ranked one starts right away, the
+# others once it has had twice its usual latency (at most GEOIP_HEDGE_DELAY) to answer.
+# One whose recent success rate is below GEOIP_MIN_SUCCESS_RATE waits GEOIP_HEDGE_DELAY more.
+GEOIP_MIN_SUCCESS_RATE = 0.5
+GEOIP_HEDGE_DELAY = 1.0
+# Weight of the newest sample in the decaying per-provider stats
+GEOIP_STATS_DECAY = 0.2
+
+_session: Optional[requests.Session] = None
+
+
+def get_session() -> requests.Session:
+    """The shared HTTP session, importing requests on first use.
+
+    Call it on the main thread before starting workers that use it, so they never race to
+    create it. Raises ImportError if requests isn't installed.
+    """
+    global _session
+    if _session is None:
+        import requests
 
-SESSION = requests.Session()
-SESSION.headers.update({"User-Agent": UA})
+        _session = requests.Session()
+        _session.headers.update({"User-Agent": UA})
+    return _session
 
 # =============== Icon and status mapping ===============
 # Reuse prior icon set for continuity
@@ -158,7 +198,11 @@ def wmo_to_status(code: int) -> str:
 # =============== Utilities ===============
 
 def esc(s: Optional[str]) -> str:
-    return html.escape(s, quote=False) if s else ""
+    if not s:
+        return ""
+    import html
+
+    return html.escape(s, quote=False)
 
 def log_debug(msg: str) -> None:
     if DEBUG:
@@ -166,8 +210,7 @@ def log_debug(msg: str) -> None:
 
 def ensure_cache_dir() -> None:
     try:
-        # CACHE_DIR is a Path
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        os.makedirs(CACHE_DIR, exist_ok=True)
     except Exception as e:
         print(f"Error creating cache dir: {e}", file=sys.stderr)
 
@@ -218,9 +261,9 @@ def coerce_number(value: Any) -> Union[int, float, None]:
 
 def read_api_cache() -> Optional[Dict[str, Any]]:
     try:
-        if not API_CACHE_PATH.exists():
+        if not os.path.exists(API_CACHE_PATH):
             return None
-        with API_CACHE_PATH.open("r", encoding="utf-8") as f:
+        with open(API_CACHE_PATH, "r", encoding="utf-8") as f:
             data = json.load(f)
         # Use ensure_dict for safety
         data_dict = ensure_dict(data)
@@ -240,12 +283,12 @@ def read_api_cache() -> Optional[Dict[str, Any]]:
         return None
 
 
-def write_api_cache(payload: Dict[str, Any]) -> None:
+def write_api_cache(payload: Dict[str, Any], timestamp: Optional[float] = None) -> None:
     try:
         ensure_cache_dir()
-        payload["timestamp"] = time.time()
+        payload["timestamp"] = time.time() if timestamp is None else timestamp
         payload["units"] = UNITS
-        with API_CACHE_PATH.open("w", encoding="utf-8") as f:
+        with open(API_CACHE_PATH, "w", encoding="utf-8") as f:
             json.dump(payload, f)
     except Exception as e:
         print(f"Error writing API cache: {e}", file=sys.stderr)
@@ -254,7 +297,7 @@ def write_api_cache(payload: Dict[str, Any]) -> None:
 def write_simple_text_cache(text: str) -> None:
     try:
         ensure_cache_dir()
-        with SIMPLE_TEXT_CACHE_PATH.open("w", encoding="utf-8") as f:
+        with open(SIMPLE_TEXT_CACHE_PATH, "w", encoding="utf-8") as f:
             f.write(text)
     except Exception as e:
         print(f"Error writing simple cache: {e}", file=sys.stderr)
@@ -269,29 +312,85 @@ def get_coords_from_env() -> Optional[Tuple[float, float]]:
     return None
 
 
-def get_coords_from_cache() -> Optional[Tuple[float, float]]:
+def read_proc_rows(path: str) -> List[List[str]]:
     try:
-        cached = read_api_cache()
-        if cached:
-            fc = ensure_dict(cached.get("forecast"))
-            lat_raw = safe_get(fc, "latitude")
-            lon_raw = safe_get(fc, "longitude")
-            lat = coerce_float(lat_raw)
-            lon = coerce_float(lon_raw)
-            if lat is None:
-                log_debug(f"Unexpected type for cached latitude: {type(lat_raw)}")
-            if lon is None:
-                log_debug(f"Unexpected type for cached longitude: {type(lon_raw)}")
-            if lat is not None and lon is not None:
-                return lat, lon
+        with open(path, encoding="ascii", errors="replace") as f:
+            return [line.split() for line in f]
+    except OSError:
+        return []
+
+
+def network_fingerprint() -> str:
+    """Describe the attached network from /proc/net: default routes, gateway MACs and local addresses.
+
+    Cheap enough to run on every invocation, and changes when the machine moves to another
+    network. IPv6 temporary (privacy) addresses are skipped and only /64 prefixes kept, since
+    those rotate without the machine moving. Returns "" where /proc/net isn't available.
+    """
+    parts: List[str] = []
+    gateways: Dict[str, str] = {}
+    for row in read_proc_rows("/proc/net/route")[1:]:
+        # Default route: destination and mask 0.0.0.0, gateway as little-endian hex
+        if len(row) >= 8 and row[1] == "00000000" and row[7] == "00000000":
+            gateway = ".".join(str(int(row[2][i:i + 2], 16)) for i in (6, 4, 2, 0))
+            gateways[gateway] = row[0]
+            parts.append(f"route {row[0]} {gateway}")
+    for row in read_proc_rows("/proc/net/arp")[1:]:
+        if len(row) >= 6 and gateways.get(row[0]) == row[5]:
+            parts.append(f"gateway {row[0]} {row[3]}")
+    rows = read_proc_rows("/proc/net/fib_trie")
+    for prev, row in zip(rows, rows[1:]):
+        # "|-- 192.168.1.20" followed by "/32 host LOCAL" is an address of this machine
+        if row[1:] == ["host", "LOCAL"] and len(prev) == 2 and not prev[1].startswith("127."):
+            parts.append(f"inet {prev[1]}")
+    for row in read_proc_rows("/proc/net/if_inet6"):
+        if len(row) >= 6 and row[3] == "00" and not int(row[4], 16) & 0x01:
+            parts.append(f"inet6 {row[5]} {row[0][:16]}")
+    return "; ".join(sorted(set(parts)))
+
+
+def read_location_cache(fresh_only: bool = True) -> Optional[Tuple[float, float]]:
+    """Cached IP geolocation coordinates, if still valid for the current network.
+
+    With fresh_only=False, any cached coordinates are returned regardless of age or network.
+    """
+    try:
+        if not os.path.exists(LOCATION_CACHE_PATH):
+            return None
+        with open(LOCATION_CACHE_PATH, "r", encoding="utf-8") as f:
+            data = ensure_dict(json.load(f))
+        lat = coerce_float(data.get("lat"))
+        lon = coerce_float(data.get("lon"))
+        if lat is None or lon is None:
+            return None
+        if fresh_only:
+            age = time.time() - (coerce_float(data.get("timestamp")) or 0)
+            if age > LOCATION_TTL_SECONDS:
+                log_debug(f"Location cache expired ({age:.0f}s old)")
+                return None
+            fingerprint = network_fingerprint()
+            if data.get("fingerprint") != fingerprint:
+                log_debug(f"Network changed: '{data.get('fingerprint')}' -> '{fingerprint}'")
+                return None
+        return lat, lon
     except Exception as e:
-        print(f"Reading cached coords failed: {e}", file=sys.stderr)
-    return None
+        print(f"Reading cached location failed: {e}", file=sys.stderr)
+        return None
+
+
+def write_location_cache(lat: float, lon: float) -> None:
+    try:
+        ensure_cache_dir()
+        payload = {"lat": lat, "lon": lon, "fingerprint": network_fingerprint(), "timestamp": time.time()}
+        with open(LOCATION_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+    except Exception as e:
+        print(f"Error writing location cache: {e}", file=sys.stderr)
 
 
 def get_coords_from_ipwho() -> Optional[Tuple[float, float]]:
     try:
-        resp = SESSION.get("https://ipwho.is/", timeout=TIMEOUT)
+        resp = get_session().get("https://ipwho.is/", timeout=TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
         if data.get("success"):
@@ -306,7 +405,7 @@ def get_coords_from_ipwho() -> Optional[Tuple[float, float]]:
 
 def get_coords_from_ipapi() -> Optional[Tuple[float, float]]:
     try:
-        resp = SESSION.get("https://ipapi.co/json", timeout=TIMEOUT)
+        resp = get_session().get("https://ipapi.co/json", timeout=TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
         lat = data.get("latitude")
@@ -320,7 +419,7 @@ def get_coords_from_ipapi() -> Optional[Tuple[float, float]]:
 
 def get_coords_from_ipinfo() -> Optional[Tuple[float, float]]:
     try:
-        resp = SESSION.get("https://ipinfo.io/json", timeout=TIMEOUT)
+        resp = get_session().get("https://ipinfo.io/json", timeout=TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
         loc = data.get("loc")
@@ -332,32 +431,228 @@ def get_coords_from_ipinfo() -> Optional[Tuple[float, float]]:
     return None
 
 
-def get_coords_from_place_name(name: str) -> Optional[Tuple[float, float]]:
+GEOIP_PROVIDERS: Dict[str, Callable[[], Optional[Tuple[float, float]]]] = {
+    "ipwho.is": get_coords_from_ipwho,
+    "ipapi.co": get_coords_from_ipapi,
+    "ipinfo.io": get_coords_from_ipinfo,
+}
+
+
+def read_geoip_stats() -> Dict[str, Dict[str, float]]:
+    try:
+        with open(GEOIP_STATS_PATH, "r", encoding="utf-8") as f:
+            data = ensure_dict(json.load(f))
+        stats: Dict[str, Dict[str, float]] = {}
+        for name, entry in data.items():
+            entry_dict = ensure_dict(entry)
+            rate = coerce_float(entry_dict.get("success_rate"))
+            latency = coerce_float(entry_dict.get("latency"))
+            if name in GEOIP_PROVIDERS and rate is not None and latency is not None:
+                stats[name] = {"success_rate": rate, "latency": latency,
+                               "lookups": coerce_float(entry_dict.get("lookups")) or 0}
+        return stats
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Reading geolocation stats failed: {e}", file=sys.stderr)
+        return {}
+
+
+def write_geoip_stats(stats: Dict[str, Dict[str, float]]) -> None:
+    try:
+        ensure_cache_dir()
+        with open(GEOIP_STATS_PATH, "w", encoding="utf-8") as f:
+            json.dump(stats, f)
+    except Exception as e:
+        print(f"Error writing geolocation stats: {e}", file=sys.stderr)
+
+
+def record_geoip_result(
+    stats: Dict[str, Dict[str, float]], name: str, ok: bool, latency: float, censored: bool = False
+) -> None:
+    """Fold one lookup into the provider's decaying success rate and latency.
+
+    A censored lookup is one still running when another provider won: it only says the
+    provider takes at least latency, so it can raise the latency but leaves the success
+    rate alone. That is how a blackholed provider falls behind without failing the
+    healthy backups that merely lost the race.
+    """
+    entry = stats.setdefault(name, {"success_rate": 1.0, "latency": latency, "lookups": 0})
+    if censored:
+        if latency > entry["latency"]:
+            entry["latency"] += GEOIP_STATS_DECAY * (latency - entry["latency"])
+        return
+    entry["success_rate"] += GEOIP_STATS_DECAY * ((1.0 if ok else 0.0) - entry["success_rate"])
+    # A failure that took longer than usual still says the provider is slow
+    if ok or latency > entry["latency"]:
+        entry["latency"] += GEOIP_STATS_DECAY * (latency - entry["latency"])
+    entry["lookups"] += 1
+
+
+def race_geoip_providers() -> Optional[Tuple[float, float]]:
+    """Query the IP geolocation providers concurrently and return the first valid coordinates.
+
+    Providers are ranked by recorded success rate, then latency. The best starts at once and
+    the rest are hedged: they start only if it hasn't answered within twice its usual latency,
+    and unreliable ones wait GEOIP_HEDGE_DELAY longer. The losers are abandoned on their
+    daemon threads once a winner answers, their requests are bounded by TIMEOUT anyway.
+    """
+    import queue
+    import threading
+
+    get_session()
+    stats = read_geoip_stats()
+    default = {"success_rate": 1.0, "latency": 0.0, "lookups": 0}
+    ranked = sorted(GEOIP_PROVIDERS, key=lambda name: (
+        -round(stats.get(name, default)["success_rate"], 1), stats.get(name, default)["latency"]))
+    # Without stats for the best provider there is nothing to hedge on, so all start together
+    hedge = min(GEOIP_HEDGE_DELAY, 2 * stats.get(ranked[0], default)["latency"])
+    start = time.monotonic()
+    results: "queue.Queue[Tuple[str, Optional[Tuple[float, float]], float]]" = queue.Queue()
+    answered = threading.Event()
+    started: Dict[str, float] = {}
+
+    def run(name: str, delay: float) -> None:
+        if delay and answered.wait(delay):
+            return
+        started[name] = time.monotonic()
+        coords = GEOIP_PROVIDERS[name]()
+        results.put((name, coords, time.monotonic() - started[name]))
+
+    delays: Dict[str, float] = {}
+    for rank, name in enumerate(ranked):
+        delay = 0.0 if rank == 0 else hedge
+        if rank and stats.get(name, default)["success_rate"] < GEOIP_MIN_SUCCESS_RATE:
+            delay += GEOIP_HEDGE_DELAY
+        delays[name] = delay
+        threading.Thread(target=run, args=(name, delay), daemon=True).start()
+
+    deadline = start + max(delays.values()) + TIMEOUT
+    winner: Optional[Tuple[float, float]] = None
+    finished = set()
+    while len(finished) < len(ranked):
+        try:
+            name, coords, latency = results.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            break
+        finished.add(name)
+        record_geoip_result(stats, name, coords is not None, latency)
+        log_debug(f"{name}: {coords} in {latency:.2f}s (started at +{delays[name]:.2f}s)")
+        if coords is not None:
+            winner = coords
+            break
+    answered.set()
+    now = time.monotonic()
+    for name, started_at in list(started.items()):
+        if name not in finished:
+            # Past TIMEOUT its request has failed, before that it only lost the race
+            running = now - started_at
+            log_debug(f"{name}: no answer after {running:.2f}s")
+            record_geoip_result(stats, name, False, running, censored=running < TIMEOUT)
+    write_geoip_stats(stats)
+    return winner
+
+
+_geocode_cache: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+def load_geocode_cache() -> Dict[str, Dict[str, Any]]:
+    global _geocode_cache
+    if _geocode_cache is None:
+        _geocode_cache = {"forward": {}, "reverse": {}}
+        try:
+            if os.path.exists(GEOCODE_CACHE_PATH):
+                with open(GEOCODE_CACHE_PATH, "r", encoding="utf-8") as f:
+                    data = ensure_dict(json.load(f))
+                for kind in _geocode_cache:
+                    _geocode_cache[kind].update(ensure_dict(data.get(kind, {})))
+        except Exception as e:
+            print(f"Reading geocoding cache failed: {e}", file=sys.stderr)
+    return _geocode_cache
+
+
+def geocode_cache_get(kind: str, key: str) -> Optional[Dict[str, Any]]:
+    """The cached entry for key, if not expired. Its "value" is None for a remembered failed lookup."""
+    entry = load_geocode_cache()[kind].get(key)
+    if not isinstance(entry, dict) or "value" not in entry:
+        return None
+    ttl = GEOCODE_TTL_SECONDS if entry["value"] is not None else GEOCODE_NEGATIVE_TTL_SECONDS
+    if time.time() - (coerce_float(entry.get("timestamp")) or 0) > ttl:
+        return None
+    log_debug(f"Geocoding cache hit ({kind}): {key} -> {entry['value']}")
+    return entry
+
+
+def geocode_cache_put(kind: str, key: str, value: Any) -> None:
+    cache = load_geocode_cache()
+    now = time.time()
+    cache[kind][key] = {"value": value, "timestamp": now}
+    # Drop expired entries so the file doesn't grow with every place ever visited
+    for entries in cache.values():
+        for k in [k for k, e in entries.items() if now - (coerce_float(ensure_dict(e).get("timestamp")) or 0) > GEOCODE_TTL_SECONDS]:
+            del entries[k]
+    try:
+        ensure_cache_dir()
+        tmp_path = f"{GEOCODE_CACHE_PATH}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, GEOCODE_CACHE_PATH)
+    except Exception as e:
+        print(f"Error writing geocoding cache: {e}", file=sys.stderr)
+
+
+def geocode_lang() -> str:
+    return os.getenv("WEATHER_LANG", "en")
+
+
+def forward_geocode_key(name: str) -> str:
+    # "Concord, NH" and " concord  nh" are the same lookup
+    return f"{geocode_lang()}|{' '.join(name.casefold().replace(',', ' ').split())}"
+
+
+def reverse_geocode_key(lat: float, lon: float) -> str:
+    return f"{geocode_lang()}|{lat:.{GEOCODE_CELL_DECIMALS}f},{lon:.{GEOCODE_CELL_DECIMALS}f}"
+
+
+def geocode_place_name(name: str) -> Optional[Tuple[float, float]]:
     """Forward geocode a place name to coordinates using Open-Meteo Geocoding API.
 
-    Returns (lat, lon) if found, else None.
+    Returns (lat, lon) if found, None if there is no such place. Raises on request errors.
     """
+    base = "https://geocoding-api.open-meteo.com/v1/search"
+    params: Dict[str, Union[str, float]] = {
+        "name": name,
+        "count": 1,
+        "language": geocode_lang(),
+        "format": "json",
+    }
+    resp = get_session().get(base, params=params, timeout=TIMEOUT)
+    resp.raise_for_status()
+    data = ensure_dict(resp.json())
+    results = ensure_list(data.get("results"))
+    if results:
+        p = ensure_dict(results[0])
+        lat = coerce_float(p.get("latitude"))
+        lon = coerce_float(p.get("longitude"))
+        if lat is not None and lon is not None:
+            return float(lat), float(lon)
+    return None
+
+
+def get_coords_from_place_name(name: str) -> Optional[Tuple[float, float]]:
+    """Forward geocode a place name, through the on-disk geocoding cache."""
+    key = forward_geocode_key(name)
+    cached = geocode_cache_get("forward", key)
+    if cached is not None:
+        value = cached["value"]
+        return (float(value[0]), float(value[1])) if value else None
     try:
-        base = "https://geocoding-api.open-meteo.com/v1/search"
-        params: Dict[str, Union[str, float]] = {
-            "name": name,
-            "count": 1,
-            "language": os.getenv("WEATHER_LANG", "en"),
-            "format": "json",
-        }
-        resp = SESSION.get(base, params=params, timeout=TIMEOUT)
-        resp.raise_for_status()
-        data = ensure_dict(resp.json())
-        results = ensure_list(data.get("results"))
-        if results:
-            p = ensure_dict(results[0])
-            lat = coerce_float(p.get("latitude"))
-            lon = coerce_float(p.get("longitude"))
-            if lat is not None and lon is not None:
-                return float(lat), float(lon)
+        coords = geocode_place_name(name)
     except Exception as e:
         print(f"Place geocoding failed: {e}", file=sys.stderr)
-    return None
+        return None
+    geocode_cache_put("forward", key, list(coords) if coords else None)
+    return coords
 
 
 def get_coords() -> Tuple[float, float]:
@@ -380,18 +675,24 @@ def get_coords() -> Tuple[float, float]:
         if coords:
             return coords
 
-    # 4) Try cached coordinates
-    coords = get_coords_from_cache()
+    # 4) Cached IP geolocation, while still on the same network
+    coords = read_location_cache()
     if coords:
         return coords
 
     # 5) IP-based geolocation
-    coords = get_coords_from_ipwho() or get_coords_from_ipapi() or get_coords_from_ipinfo()
+    coords = race_geoip_providers()
     if coords:
+        write_location_cache(*coords)
         return coords
 
-    # 6) Last resort
+    # 6) Last known location, however old
     print("IP geolocation failed: no providers succeeded", file=sys.stderr)
+    coords = read_location_cache(fresh_only=False)
+    if coords:
+        return coords
+
+    # 7) Last resort
     return 0.0, 0.0
 
 
@@ -437,7 +738,7 @@ def fetch_open_meteo(lat: float, lon: float) -> Dict[str, Any]:
         "timezone": "auto",
     }
     params.update(units_params(UNITS))
-    resp = SESSION.get(base, params=params, timeout=TIMEOUT)
+    resp = get_session().get(base, params=params, timeout=TIMEOUT)
     resp.raise_for_status()
     return resp.json()
 
@@ -451,7 +752,7 @@ def fetch_aqi(lat: float, lon: float) -> Optional[Dict[str, Any]]:
             "current": "european_aqi",
             "timezone": "auto",
         }
-        resp = SESSION.get(base, params=params, timeout=TIMEOUT)
+        resp = get_session().get(base, params=params, timeout=TIMEOUT)
         resp.raise_for_status()
         return resp.json()
     except Exception as e:
@@ -490,46 +791,48 @@ def extract_place_parts_open_meteo(p: JSONDict) -> List[str]:
 
 
 def reverse_geocode(base: str, params: Dict[str, Union[str, float]], headers: Optional[Dict[str, str]] = None) -> Optional[str]:
-    try:
-        resp = SESSION.get(base, params=params, headers=headers, timeout=TIMEOUT)
-        resp.raise_for_status()
-        data = resp.json()
-        data_dict = ensure_dict(data)
-        parts = extract_place_parts_nominatim(data_dict)
-        if parts:
-            return ", ".join(parts)
-    except Exception as e:
-        log_debug(f"Reverse geocoding failed: {e}")
+    resp = get_session().get(base, params=params, headers=headers, timeout=TIMEOUT)
+    resp.raise_for_status()
+    data = resp.json()
+    data_dict = ensure_dict(data)
+    parts = extract_place_parts_nominatim(data_dict)
+    if parts:
+        return ", ".join(parts)
     return None
 
 
 def reverse_geocode_open_meteo(lat: float, lon: float, lang: str) -> Optional[str]:
-    try:
-        base = "https://geocoding-api.open-meteo.com/v1/reverse"
-        params: Dict[str, Union[str, float]] = {
-            "latitude": lat,
-            "longitude": lon,
-            "language": lang,
-            "format": "json",
-        }
-        resp = SESSION.get(base, params=params, timeout=TIMEOUT)
-        resp.raise_for_status()
-        data = resp.json()
-        data_dict = ensure_dict(data)
-        results = ensure_list(data_dict.get("results"))
-        if results:
-            p = ensure_dict(results[0])
-            parts = extract_place_parts_open_meteo(p)
-            if parts:
-                return ", ".join(parts)
-    except Exception as e:
-        log_debug(f"Reverse geocoding (Open-Meteo) failed: {e}")
+    base = "https://geocoding-api.open-meteo.com/v1/reverse"
+    params: Dict[str, Union[str, float]] = {
+        "latitude": lat,
+        "longitude": lon,
+        "language": lang,
+        "format": "json",
+    }
+    resp = get_session().get(base, params=params, timeout=TIMEOUT)
+    resp.raise_for_status()
+    data = resp.json()
+    data_dict = ensure_dict(data)
+    results = ensure_list(data_dict.get("results"))
+    if results:
+        p = ensure_dict(results[0])
+        parts = extract_place_parts_open_meteo(p)
+        if parts:
+            return ", ".join(parts)
     return None
 
 
 def fetch_place(lat: float, lon: float) -> Optional[str]:
-    """Reverse geocode lat/lon to an approximate place. Tries Nominatim first, then Open-Meteo."""
-    lang = os.getenv("WEATHER_LANG", "en")
+    """Reverse geocode lat/lon to an approximate place. Tries Nominatim first, then Open-Meteo.
+
+    Results are cached per ~1 km cell; a cell is only remembered as unnamed when a provider
+    answered without a name, not when both requests failed.
+    """
+    key = reverse_geocode_key(lat, lon)
+    cached = geocode_cache_get("reverse", key)
+    if cached is not None:
+        return cast(Optional[str], cached["value"])
+    lang = geocode_lang()
 
     # 1) Nominatim (OpenStreetMap)
     base = "https://nominatim.openstreetmap.org/reverse"
@@ -540,12 +843,25 @@ def fetch_place(lat: float, lon: float) -> Optional[str]:
         "accept-language": lang,
     }
     headers = {"User-Agent": UA + " Weather.py/1.0"}
-    place = reverse_geocode(base, params, headers)
-    if place:
-        return place
-
     # 2) Open-Meteo reverse (fallback)
-    return reverse_geocode_open_meteo(lat, lon, lang)
+    lookups: List[Tuple[str, Callable[[], Optional[str]]]] = [
+        ("Nominatim", lambda: reverse_geocode(base, params, headers)),
+        ("Open-Meteo", lambda: reverse_geocode_open_meteo(lat, lon, lang)),
+    ]
+    answered = False
+    for provider, lookup in lookups:
+        try:
+            place = lookup()
+        except Exception as e:
+            log_debug(f"Reverse geocoding ({provider}) failed: {e}")
+            continue
+        answered = True
+        if place:
+            geocode_cache_put("reverse", key, place)
+            return place
+    if answered:
+        geocode_cache_put("reverse", key, None)
+    return None
 
 
 # =============== Build Output ===============
@@ -842,23 +1158,146 @@ def try_cached_weather(lat: float, lon: float) -> Optional[Tuple[Dict[str, str],
     return None
 
 
-def fetch_fresh_weather(lat: float, lon: float) -> Optional[Tuple[Dict[str, str], str]]:
+def run_concurrently(
+    required: Tuple[str, Callable[[], Any]], optional: Dict[str, Callable[[], Any]]
+) -> Tuple[Dict[str, Any], List[str]]:
+    """Run the required task and the optional ones in parallel, under FETCH_DEADLINE.
+
+    Returns every result that arrived in time, plus the names of the optional tasks still
+    running OPTIONAL_GRACE after the required one finished. Optional tasks that fail are
+    left out. Raises TimeoutError if the required task misses the deadline, or re-raises
+    its exception.
+    """
+    import queue
+    import threading
+
+    start = time.monotonic()
+    deadline = start + FETCH_DEADLINE
+    results: "queue.Queue[Tuple[str, bool, Any]]" = queue.Queue()
+
+    def run(name: str, fn: Callable[[], Any]) -> None:
+        try:
+            results.put((name, True, fn()))
+        except Exception as e:
+            results.put((name, False, e))
+
+    required_name = required[0]
+    # Daemon threads, so a provider stuck in its own TIMEOUT doesn't hold up exiting
+    for name, fn in [required, *optional.items()]:
+        threading.Thread(target=run, args=(name, fn), daemon=True).start()
+
+    pending = {required_name, *optional}
+    done: Dict[str, Any] = {}
+    until = deadline
+    while pending:
+        try:
+            name, ok, value = results.get(timeout=max(0.0, until - time.monotonic()))
+        except queue.Empty:
+            break
+        pending.discard(name)
+        log_debug(f"{name} finished in {time.monotonic() - start:.2f}s{'' if ok else f' with error: {value}'}")
+        if name == required_name:
+            if not ok:
+                raise value
+            until = min(until, time.monotonic() + OPTIONAL_GRACE)
+        if ok:
+            done[name] = value
+
+    if required_name not in done:
+        raise TimeoutError(f"{required_name} did not finish within {FETCH_DEADLINE:g}s")
+    for name in pending:
+        log_debug(f"Leaving {name} out of this run: not available in time")
+    return done, sorted(pending)
+
+
+def read_cached_place(lat: float, lon: float) -> Optional[str]:
+    """The place stored with the last fetch for these coordinates, however old."""
+    try:
+        with open(API_CACHE_PATH, "r", encoding="utf-8") as f:
+            cached = ensure_dict(json.load(f))
+        fc = ensure_dict(cached.get("forecast"))
+        c_lat = coerce_float(safe_get(fc, "latitude"))
+        c_lon = coerce_float(safe_get(fc, "longitude"))
+        place = cached.get("place")
+        if c_lat is not None and c_lon is not None and abs(c_lat - lat) <= 0.1 and abs(c_lon - lon) <= 0.1:
+            return place if isinstance(place, str) else None
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        log_debug(f"Reading cached place failed: {e}")
+    return None
+
+
+def fetch_fresh_weather(lat: float, lon: float, emit: Callable[[Tuple[Dict[str, str], str]], None]) -> bool:
+    """Fetch and emit the output, leaving optional lookups that ran late to a detached child.
+
+    Returns False if the forecast couldn't be fetched, nothing was emitted then.
+    """
     try:
-        forecast = fetch_open_meteo(lat, lon)
-        aqi = fetch_aqi(lat, lon)
+        optional: Dict[str, Callable[[], Any]] = {"aqi": lambda: fetch_aqi(lat, lon)}
         # If MANUAL_PLACE is set, don't reverse geocode - use the manual place instead
-        place = MANUAL_PLACE if MANUAL_PLACE else fetch_place(lat, lon)
-        write_api_cache({"forecast": forecast, "aqi": aqi, "place": place})
-        return build_output(Location(lat, lon, place), forecast, aqi)
+        if not MANUAL_PLACE:
+            optional["place"] = lambda: fetch_place(lat, lon)
+        results, late = run_concurrently(("forecast", lambda: fetch_open_meteo(lat, lon)), optional)
+        forecast = results["forecast"]
+        aqi = results.get("aqi")
+        # A slow reverse geocode shows the place of the previous fetch rather than coordinates
+        place = MANUAL_PLACE if MANUAL_PLACE else results.get("place") or read_cached_place(lat, lon)
+        payload = {"forecast": forecast, "aqi": aqi, "place": place}
+        write_api_cache(payload)
+        result = build_output(Location(lat, lon, place), forecast, aqi)
     except Exception as e:
         print(f"Open-Meteo fetch failed: {e}", file=sys.stderr)
-    return None
+        return False
+    emit(result)
+    if late:
+        start_late_fill(lat, lon, late)
+    return True
+
+
+def start_late_fill(lat: float, lon: float, names: List[str]) -> None:
+    """Hand the optional lookups that missed this run to a detached child.
+
+    Waybar reads until EOF, so waiting for them here would hold the forecast back; the child
+    has its own session and no stdout/stderr, so the pipe closes when this process exits.
+    """
+    import subprocess
+
+    try:
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--fill-late", str(lat), str(lon), *names],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        log_debug(f"Starting the late fill failed: {e}")
+
+
+def fill_late_results(lat: float, lon: float, names: List[str]) -> None:
+    """Redo the named optional lookups and fold their results into the API cache.
+
+    fetch_place also stores the place in the geocoding cache. The API cache keeps its
+    timestamp, and is left alone if a newer fetch moved it to other coordinates.
+    """
+    fetchers: Dict[str, Callable[[], Any]] = {"aqi": lambda: fetch_aqi(lat, lon), "place": lambda: fetch_place(lat, lon)}
+    late = {name: fetchers[name]() for name in names if name in fetchers}
+    late = {name: value for name, value in late.items() if value}
+    cached = read_api_cache()
+    if not late or cached is None:
+        return
+    fc = ensure_dict(cached.get("forecast"))
+    c_lat = coerce_float(safe_get(fc, "latitude"))
+    c_lon = coerce_float(safe_get(fc, "longitude"))
+    if c_lat is None or c_lon is None or abs(c_lat - lat) > 0.1 or abs(c_lon - lon) > 0.1:
+        return
+    cached.update(late)
+    write_api_cache(cached, coerce_float(cached.get("timestamp")))
 
 
 def try_stale_weather(lat: float, lon: float) -> Optional[Tuple[Dict[str, str], str]]:
     try:
-        if API_CACHE_PATH.exists():
-            with API_CACHE_PATH.open("r", encoding="utf-8") as f:
+        if os.path.exists(API_CACHE_PATH):
+            with open(API_CACHE_PATH, "r", encoding="utf-8") as f:
                 stale = json.load(f)
             stale_dict = ensure_dict(stale)
             place_val = stale_dict.get("place")
@@ -871,31 +1310,31 @@ def try_stale_weather(lat: float, lon: float) -> Optional[Tuple[Dict[str, str],
     return None
 
 
+def emit_result(result: Tuple[Dict[str, str], str]) -> None:
+    out, simple = result
+    print(json.dumps(out, ensure_ascii=False), flush=True)
+    write_simple_text_cache(simple)
+
+
 def main() -> None:
     lat, lon = get_coords()
 
     # Try cache first
     result = try_cached_weather(lat, lon)
     if result:
-        out, simple = result
-        print(json.dumps(out, ensure_ascii=False))
-        write_simple_text_cache(simple)
+        emit_result(result)
         return
 
-    # Fetch fresh
-    result = fetch_fresh_weather(lat, lon)
-    if result:
-        out, simple = result
-        print(json.dumps(out, ensure_ascii=False))
-        write_simple_text_cache(simple)
+    # Fetch fresh. Loading requests here, before the fetch threads start, also makes a missing
+    # requests a non-zero exit so WeatherWrap.sh falls back to Weather.sh
+    get_session()
+    if fetch_fresh_weather(lat, lon, emit_result):
         return
 
     # Last resort: try stale cache
     result = try_stale_weather(lat, lon)
     if result:
-        out, simple = result
-        print(json.dumps(out, ensure_ascii=False))
-        write_simple_text_cache(simple)
+        emit_result(result)
         return
 
     # Fallback minimal output
@@ -938,5 +1377,7 @@ def test_coerce_functions():
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "--test":
         test_coerce_functions()
+    elif len(sys.argv) > 3 and sys.argv[1] == "--fill-late":
+        fill_late_results(float(sys.argv[2]), float(sys.argv[3]), sys.argv[4:])
     else:
         main()
@@ -1,34 +1,65 @@
 #!/usr/bin/env python3
+"""
+Emoji codepoint data for stripping emoji from window titles.
+EMOJI_RANGES is the Extended_Pictographic property from Unicode emoji-data.txt (15.1) from
+U+2300 up, plus the emoji components (ZWJ, variation selectors, keycap, skin tones,
+regional indicators, tags) and the ranges the original hand-written regex covered.
+Extended_Pictographic below U+2300 (©, ®, ™, ‼, ↔, ...) is left out, those are
+routinely used as plain text in titles.
+"""
 
-import re
-
-EMOJI_RE = re.compile(
-    "["
-    "\U0001F600-\U0001F64F"  # emoticons
-    "\U0001F300-\U0001F5FF"  # symbols & pictographs
-    "\U0001F680-\U0001F6FF"  # transport & map
-    "\U0001F1E0-\U0001F1FF"  # flags
-    "\U0001F900-\U0001F9FF"  # supplemental symbols
-    "\U0001FA00-\U0001FA6F"  # chess symbols
-    "\U0001FA70-\U0001FAFF"  # symbols extended-A
-    "\U00002702-\U000027B0"  # dingbats
-    "\U0000FE00-\U0000FE0F"  # variation selectors
-    "\U0000200D"             # zero width joiner
-    "\U000020E3"             # combining enclosing keycap
-    "\U00002600-\U000026FF"  # misc symbols
-    "\U0000231A-\U0000231B"  # watch/hourglass
-    "\U00002934-\U00002935"  # arrows
-    "\U000025AA-\U000025AB"  # squares
-    "\U000025FB-\U000025FE"  # squares
-    "\U00002B05-\U00002B07"  # arrows
-    "\U00002B1B-\U00002B1C"  # squares
-    "\U00002B50"             # star
-    "\U00002B55"             # circle
-    "\U00003030"             # wavy dash
-    "\U0000303D"             # part alternation mark
-    "\U00003297"             # circled ideograph congratulation
-    "\U00003299"             # circled ideograph secret
-    "]+",
-    flags=re.UNICODE,
-)
+EMOJI_RANGES = [
+    (0x200D, 0x200D),      # zero width joiner
+    (0x20E3, 0x20E3),      # combining enclosing keycap
+    (0x231A, 0x231B),      # watch, hourglass
+    (0x2328, 0x2328),      # keyboard
+    (0x2388, 0x2388),      # helm symbol
+    (0x23CF, 0x23CF),      # eject
+    (0x23E9, 0x23F3),      # media controls, clocks
+    (0x23F8, 0x23FA),      # media controls
+    (0x24C2, 0x24C2),      # circled M
+    (0x25AA, 0x25AB),      # squares
+    (0x25B6, 0x25B6),      # play
+    (0x25C0, 0x25C0),      # reverse
+    (0x25FB, 0x25FE),      # squares
+    (0x2600, 0x27B0),      # misc symbols, dingbats
+    (0x27BF, 0x27BF),      # double curly loop
+    (0x2934, 0x2935),      # arrows
+    (0x2B05, 0x2B07),      # arrows
+    (0x2B1B, 0x2B1C),      # squares
+    (0x2B50, 0x2B50),      # star
+    (0x2B55, 0x2B55),      # circle
+    (0x3030, 0x3030),      # wavy dash
+    (0x303D, 0x303D),      # part alternation mark
+    (0x3297, 0x3297),      # circled ideograph congratulation
+    (0x3299, 0x3299),      # circled ideograph secret
+    (0xFE00, 0xFE0F),      # variation selectors
+    (0x1F000, 0x1F0FF),    # mahjong, domino, playing cards
+    (0x1F10D, 0x1F10F),    # circled zero with slash, ...
+    (0x1F12F, 0x1F12F),    # copyleft
+    (0x1F16C, 0x1F171),    # raised marks, A/B buttons
+    (0x1F17E, 0x1F17F),    # O/P buttons
+    (0x1F18E, 0x1F18E),    # AB button
+    (0x1F191, 0x1F19A),    # squared CL .. VS
+    (0x1F1AD, 0x1F1FF),    # mask work symbol, regional indicators
+    (0x1F201, 0x1F20F),    # squared katakana
+    (0x1F21A, 0x1F21A),    # squared CJK
+    (0x1F22F, 0x1F22F),    # squared CJK
+    (0x1F232, 0x1F23A),    # squared CJK
+    (0x1F23C, 0x1F23F),    # reserved
+    (0x1F249, 0x1F64F),    # symbols & pictographs, skin tones, emoticons
+    (0x1F680, 0x1F6FF),    # transport & map
+    (0x1F774, 0x1F77F),    # alchemical (reserved)
+    (0x1F7D5, 0x1F7FF),    # geometric shapes extended
+    (0x1F80C, 0x1F80F),    # supplemental arrows (reserved)
+    (0x1F848, 0x1F84F),    # supplemental arrows (reserved)
+    (0x1F85A, 0x1F85F),    # supplemental arrows (reserved)
+    (0x1F888, 0x1F88F),    # supplemental arrows (reserved)
+    (0x1F8AE, 0x1F8FF),    # supplemental arrows (reserved)
+    (0x1F900, 0x1FAFF),    # supplemental symbols, chess, symbols extended-A
+    (0x1FC00, 0x1FFFD),    # reserved for future emoji
+    (0xE0020, 0xE007F),    # tags (subdivision flags)
+]
 
+# Every codepoint in EMOJI_RANGES, for set lookups against the characters of a title
+EMOJI_CHARS = frozenset(chr(codepoint) for start, end in EMOJI_RANGES for codepoint in range(start, end + 1))
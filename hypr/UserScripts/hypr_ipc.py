@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Minimal in-process client for the Hyprland IPC sockets.
+Talks to .socket.sock directly instead of forking hyprctl, and supports the
+[[BATCH]] request form so several queries share a single round trip.
+"""
+
+import os
+import socket
+
+BATCH_PREFIX = "[[BATCH]]"
+# Hyprland joins the replies of a batch request with this delimiter
+BATCH_DELIMITER = "\n\n\n"
+RECV_SIZE = 65536
+
+
+def socket_dir() -> str:
+    """Return the directory holding the sockets of the running Hyprland instance."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}")
+    signature = os.environ.get("HYPRLAND_INSTANCE_SIGNATURE", "")
+    return os.path.join(runtime_dir, "hypr", signature)
+
+
+def request_socket_path() -> str:
+    return os.path.join(socket_dir(), ".socket.sock")
+
+
+def event_socket_path() -> str:
+    return os.path.join(socket_dir(), ".socket2.sock")
+
+
+def request(command: str, timeout: float = 2.0) -> str:
+    """Send a single request (e.g. 'j/clients' or 'dispatch vdeskreset') and return the reply.
+
+    Raises OSError if the socket is missing or the request times out.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(request_socket_path())
+        sock.sendall(command.encode())
+        chunks: list[bytes] = []
+        while True:
+            chunk = sock.recv(RECV_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b"".join(chunks).decode(errors="replace")
+
+
+def batch(commands: list[str], timeout: float = 2.0) -> list[str]:
+    """Send several requests as one [[BATCH]] round trip and return one reply per command.
+
+    Commands must not contain ';' since Hyprland uses it to split the batch.
+    """
+    if not commands:
+        return []
+    if len(commands) == 1:
+        return [request(commands[0], timeout)]
+    reply = request(BATCH_PREFIX + ";".join(commands), timeout)
+    replies = reply.split(BATCH_DELIMITER)
+    if len(replies) != len(commands):
+        raise ValueError(f"batch reply has {len(replies)} parts, expected {len(commands)}")
+    return replies
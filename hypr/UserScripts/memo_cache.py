@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Bounded LRU memos for pure string transforms.
+They live in memory only. The daemon keeps them for its whole lifetime, so titles
+seen on earlier passes are dictionary hits; one-shot runs start empty, since loading
+and saving a cache file costs more than cleaning a desktop's worth of titles.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+
+class LRUMemo:
+    """Memoize fn, keeping the max_entries most recently used results."""
+
+    def __init__(self, fn: Callable[..., str], max_entries: int):
+        self.fn = fn
+        self.max_entries = max_entries
+        self.entries: OrderedDict[tuple[Hashable, ...], str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, *args: Hashable) -> str:
+        try:
+            value = self.entries[args]
+        except KeyError:
+            self.misses += 1
+            value = self.entries[args] = self.fn(*args)
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            return value
+        self.hits += 1
+        self.entries.move_to_end(args)
+        return value
+
+    def stats(self) -> str:
+        return f"{self.hits} hits/{self.misses} misses/{len(self.entries)} entries"
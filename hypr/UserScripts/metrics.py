@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Per-phase timing of rename passes.
+Each pass records a span per phase. Finished passes are appended to a JSON-lines log and
+exported to a Prometheus textfile-collector file, with cumulative histograms and quantiles
+rolled over the last ROLLING_WINDOW_SECONDS, so a long-running daemon shows a workday's tail.
+"""
+
+import bisect
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+
+BUCKETS_SECONDS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5]
+ROLLING_WINDOW_SECONDS = 10 * 60 * 60
+ROLLING_SLICE_SECONDS = 60
+QUANTILES = [0.5, 0.95, 0.99]
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram, plus the same buckets rolled over time slices
+    so quantiles can be estimated for the last ROLLING_WINDOW_SECONDS only."""
+
+    def __init__(self):
+        # One extra bucket for samples above the last bound (+Inf)
+        self.bucket_counts = [0] * (len(BUCKETS_SECONDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.slices: deque[tuple[int, list[int]]] = deque()
+        self.rolling_counts = [0] * (len(BUCKETS_SECONDS) + 1)
+
+    def observe(self, seconds: float, now: float) -> None:
+        index = bisect.bisect_left(BUCKETS_SECONDS, seconds)
+        self.bucket_counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+
+        slice_id = int(now // ROLLING_SLICE_SECONDS)
+        if not self.slices or self.slices[-1][0] != slice_id:
+            self.slices.append((slice_id, [0] * len(self.rolling_counts)))
+        self.slices[-1][1][index] += 1
+        self.rolling_counts[index] += 1
+        oldest = slice_id - ROLLING_WINDOW_SECONDS // ROLLING_SLICE_SECONDS
+        while self.slices[0][0] <= oldest:
+            for i, count in enumerate(self.slices.popleft()[1]):
+                self.rolling_counts[i] -= count
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile of the rolling window, interpolating inside the bucket like histogram_quantile."""
+        total = sum(self.rolling_counts)
+        if not total:
+            return 0.0
+        rank = q * total
+        cumulative = 0
+        for i, count in enumerate(self.rolling_counts):
+            if cumulative + count >= rank and count:
+                if i == len(BUCKETS_SECONDS):
+                    return BUCKETS_SECONDS[-1]
+                lower = BUCKETS_SECONDS[i - 1] if i else 0.0
+                return lower + (BUCKETS_SECONDS[i] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return BUCKETS_SECONDS[-1]
+
+
+class PassMetrics:
+    def __init__(self):
+        self.log_path: str | None = None
+        self.prom_path: str | None = None
+        self.histograms: dict[str, Histogram] = {}
+        self.passes = 0
+        self.phases: dict[str, float] = {}
+        self._pass_start = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.log_path is not None or self.prom_path is not None
+
+    def start_pass(self) -> None:
+        self.phases = {}
+        self._pass_start = time.perf_counter()
+
+    @contextmanager
+    def span(self, phase: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[phase] = self.phases.get(phase, 0.0) + time.perf_counter() - start
+
+    def finish_pass(self, counters: dict[str, float]) -> None:
+        """Record the spans of the current pass and export them."""
+        phases = dict(self.phases, total=time.perf_counter() - self._pass_start)
+        now = time.time()
+        self.passes += 1
+        for phase, seconds in phases.items():
+            self.histograms.setdefault(phase, Histogram()).observe(seconds, now)
+        if self.log_path:
+            record = {"ts": round(now, 3), "phases_ms": {p: round(s * 1000, 3) for p, s in phases.items()}}
+            record.update(counters)
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        if self.prom_path:
+            self._write_prom(counters)
+
+    def _write_prom(self, counters: dict[str, float]) -> None:
+        lines = [
+            "# HELP rename_phase_seconds Duration of RenameWorkspaces pass phases.",
+            "# TYPE rename_phase_seconds histogram",
+        ]
+        for phase, hist in sorted(self.histograms.items()):
+            cumulative = 0
+            for bound, count in zip(BUCKETS_SECONDS, hist.bucket_counts[:-1]):
+                cumulative += count
+                lines.append(f'rename_phase_seconds_bucket{{phase="{phase}",le="{bound}"}} {cumulative}')
+            lines.append(f'rename_phase_seconds_bucket{{phase="{phase}",le="+Inf"}} {hist.count}')
+            lines.append(f'rename_phase_seconds_sum{{phase="{phase}"}} {hist.sum:.6f}')
+            lines.append(f'rename_phase_seconds_count{{phase="{phase}"}} {hist.count}')
+
+        lines += [
+            f"# HELP rename_phase_rolling_seconds Phase duration quantiles over the last {ROLLING_WINDOW_SECONDS}s.",
+            "# TYPE rename_phase_rolling_seconds gauge",
+        ]
+        for phase, hist in sorted(self.histograms.items()):
+            for q in QUANTILES:
+                lines.append(f'rename_phase_rolling_seconds{{phase="{phase}",quantile="{q}"}} {hist.quantile(q):.6f}')
+
+        lines += [
+            "# HELP rename_passes_total Rename passes recorded by this process.",
+            "# TYPE rename_passes_total counter",
+            f"rename_passes_total {self.passes}",
+        ]
+        for name, value in sorted(counters.items()):
+            lines += [f"# TYPE rename_{name} counter", f"rename_{name} {value}"]
+
+        # The textfile collector may read at any time, so replace the file atomically
+        tmp_path = f"{self.prom_path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.prom_path)
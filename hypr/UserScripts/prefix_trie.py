@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Separator-aware prefix trie over tmux session names.
+Each node is a prefix ending at a separator character and counts the names sharing it.
+Names can be added and removed as sessions come and go, and every node caches the
+longest prefix shared by at least 2 names in its subtree, so the answer is kept up to
+date in O(depth) per update instead of being recomputed from scratch. Between equally
+long prefixes the one of the earliest name wins, as in a from-scratch scan of the names.
+"""
+
+from collections import Counter
+
+SEPARATORS = set("-_/. ")
+
+
+class _Node:
+    __slots__ = ("prefix", "count", "children", "best")
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self.count = 0
+        self.children: dict[str, _Node] = {}
+        self.best: _Node | None = None
+
+    def recompute_best(self) -> None:
+        best = self if self.count >= 2 and self.prefix else None
+        for child in self.children.values():
+            best = _better(best, child.best)
+        self.best = best
+
+
+def _better(a: "_Node | None", b: "_Node | None") -> "_Node | None":
+    if a is None:
+        return b
+    if b is None:
+        return a
+    # Only the length matters here, longest_shared_prefix settles ties by name order
+    if len(b.prefix) > len(a.prefix):
+        return b
+    return a
+
+
+def split_segments(name: str) -> list[str]:
+    """Split a name into separator-terminated segments, dropping the unterminated tail.
+
+    'ofirg-DR-1299-fix-bug' -> ['ofirg-', 'DR-', '1299-', 'fix-']
+    """
+    segments = []
+    start = 0
+    for i, ch in enumerate(name):
+        if ch in SEPARATORS:
+            segments.append(name[start:i + 1])
+            start = i + 1
+    return segments
+
+
+class PrefixTrie:
+    """Multiset of names answering "longest separator-terminated prefix shared by >= 2 names"."""
+
+    def __init__(self):
+        self._root = _Node("")
+        # Insertion order is the name order ties are settled by
+        self.names: dict[str, int] = {}
+        # longest_shared_prefix's answer, until the next change
+        self._answer: str | None = None
+
+    def add(self, name: str) -> None:
+        self._answer = None
+        self.names[name] = self.names.get(name, 0) + 1
+        path = [self._root]
+        node = self._root
+        for segment in split_segments(name):
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = _Node(node.prefix + segment)
+            child.count += 1
+            path.append(child)
+            node = child
+        # Counts only grew, so each best can only improve along the path
+        for node, child in zip(reversed(path), [None] + path[:0:-1]):
+            own = node if node.count >= 2 and node.prefix else None
+            node.best = _better(_better(node.best, own), child.best if child else None)
+
+    def remove(self, name: str) -> None:
+        if name not in self.names:
+            raise KeyError(name)
+        self._answer = None
+        self.names[name] -= 1
+        if not self.names[name]:
+            del self.names[name]
+        path = [self._root]
+        node = self._root
+        for segment in split_segments(name):
+            node = node.children[segment]
+            node.count -= 1
+            path.append(node)
+        path[-1].recompute_best()
+        for parent, node in zip(reversed(path[:-1]), reversed(path[1:])):
+            if not node.count:
+                del parent.children[node.prefix[len(parent.prefix):]]
+            # A best outside the shrunk path is still valid, only rescan when it was on it
+            if parent.best is parent or (parent.best is not None and parent.best.prefix.startswith(node.prefix)):
+                parent.recompute_best()
+
+    def sync(self, names: list[str]) -> None:
+        """Add and remove names so the trie holds exactly the given multiset, in the given order."""
+        wanted = dict(Counter(names))
+        if wanted == self.names:
+            # Same multiset, but the order may differ
+            if list(wanted) != list(self.names):
+                self.names = wanted
+                self._answer = None
+            return
+        for name in self.names.keys() - wanted.keys():
+            for _ in range(self.names[name]):
+                self.remove(name)
+        for name, count in wanted.items():
+            current = self.names.get(name, 0)
+            if count != current:
+                for _ in range(current - count):
+                    self.remove(name)
+                for _ in range(count - current):
+                    self.add(name)
+        self.names = wanted
+        self._answer = None
+
+    def _count(self, prefix: str) -> int:
+        node = self._root
+        for segment in split_segments(prefix):
+            node = node.children.get(segment)
+            if node is None:
+                return 0
+        return node.count
+
+    def longest_shared_prefix(self) -> str:
+        if self._answer is None:
+            self._answer = self._find_answer()
+        return self._answer
+
+    def _find_answer(self) -> str:
+        best = self._root.best
+        if best is None:
+            return ""
+        # Several prefixes may share the longest length; take the one of the earliest name
+        length = len(best.prefix)
+        for name in self.names:
+            if len(name) >= length and name[length - 1] in SEPARATORS:
+                prefix = name[:length]
+                if prefix == best.prefix or self._count(prefix) >= 2:
+                    return prefix
+        return best.prefix
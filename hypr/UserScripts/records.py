@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Compact records for the parts of Hyprland's JSON output the renamer reads.
+A `hyprctl clients -j` entry has dozens of keys (at, size, grouped, swallowing, ...); a
+Client keeps the five the naming logic uses in __slots__, so a long-lived daemon holds
+no per-client dicts and attribute access is a slot lookup instead of a dict.get.
+clients_from_text goes one step further and pulls those fields straight out of the
+response text, without building the dicts in the first place.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Client:
+    """A window. Records are replaced, never mutated, so they can be shared across threads."""
+    address: str
+    cls: str
+    title: str
+    workspace_id: int | None
+    workspace_name: str
+
+
+@dataclass(slots=True)
+class Workspace:
+    id: int | None
+    name: str
+
+
+@dataclass(slots=True)
+class Vdesk:
+    """A virtual desktop from the virtual-desktops plugin's printstate."""
+    id: int | None
+    name: str
+    focused: bool
+    populated: bool
+    workspaces: tuple[int, ...]
+
+
+def client_from_json(data: dict) -> Client:
+    workspace = data.get("workspace") or {}
+    return Client(data.get("address", ""), data.get("class", ""), data.get("title", ""),
+                  workspace.get("id"), workspace.get("name", ""))
+
+
+def workspace_from_json(data: dict) -> Workspace:
+    return Workspace(data.get("id"), data.get("name", ""))
+
+
+def vdesk_from_json(data: dict) -> Vdesk:
+    return Vdesk(data.get("id"), data.get("name", ""), bool(data.get("focused")), bool(data.get("populated")),
+                 tuple(data.get("workspaces", ())))
+
+
+# A JSON string body, unrolled so the regex engine loops over plain runs instead of single chars.
+# Inside a string every quote is escaped, so a `"key":` match is always a real key
+_STRING = r'"([^"\\]*(?:\\.[^"\\]*)*)"'
+_ADDRESS_RE = re.compile(r'"address":\s*' + _STRING)
+_CLASS_RE = re.compile(r'"class":\s*' + _STRING)
+_TITLE_RE = re.compile(r'"title":\s*' + _STRING)
+_WORKSPACE_RE = re.compile(r'"workspace":\s*\{\s*"id":\s*(-?\d+),\s*"name":\s*' + _STRING)
+
+
+def _unescape(value: str) -> str:
+    return json.loads(f'"{value}"') if "\\" in value else value
+
+
+def clients_from_text(text: str) -> list[Client]:
+    """
+    Decode `hyprctl clients -j` output by scanning for the five keys a Client keeps.
+    Each key occurs exactly once per client, so the matches line up by position. When they
+    don't (a field missing, a layout change), this falls back to json.loads, which also
+    raises json.JSONDecodeError for output that isn't JSON at all.
+    """
+    addresses = _ADDRESS_RE.findall(text)
+    classes = _CLASS_RE.findall(text)
+    titles = _TITLE_RE.findall(text)
+    workspaces = _WORKSPACE_RE.findall(text)
+    if not addresses or not len(addresses) == len(classes) == len(titles) == len(workspaces):
+        return [client_from_json(client) for client in json.loads(text)]
+    return [Client(address, _unescape(cls), _unescape(title), int(workspace_id), _unescape(workspace_name))
+            for address, cls, title, (workspace_id, workspace_name)
+            in zip(addresses, classes, titles, workspaces)]
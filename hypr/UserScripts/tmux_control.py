@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Persistent tmux control-mode client that pushes agent status changes.
+Subscribes (refresh-client -B) to a format covering @ai-agent-status and @monitor-status
+of every window in every session. When tmux reports a change, the statuses are re-read
+through the same connection, so an update costs no fork and no polling on our side.
+"""
+
+import asyncio
+from typing import Callable
+
+SUBSCRIPTION_NAME = "agent-status"
+# Only used as a change trigger, the statuses themselves are read with STATUS_COMMAND
+SUBSCRIPTION_FORMAT = "#{S:#{W:#{session_name}:#{window_index}=#{@ai-agent-status}/#{@monitor-status} }}"
+STATUS_FORMAT = "#{session_name}|#{@ai-agent-status}|#{@monitor-status}"
+STATUS_COMMAND = f"list-windows -a -F '{STATUS_FORMAT}'"
+
+RETRY_DELAY_SECONDS = 2.0
+MAX_RETRY_DELAY_SECONDS = 30.0
+
+
+async def watch_statuses(on_statuses: Callable[[str], None], on_disconnect: Callable[[], None]) -> None:
+    """Keep a control-mode client attached and call on_statuses with the raw STATUS_FORMAT
+    output (one line per window) on connect and after every change.
+
+    on_disconnect is called whenever the client goes away (no tmux server, server exit),
+    after which the connection is retried with backoff.
+    """
+    retry_delay = RETRY_DELAY_SECONDS
+    while True:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "tmux", "-C", "attach-session", "-f", "no-output,ignore-size",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except OSError:
+            # tmux isn't installed, nothing to watch
+            return
+
+        try:
+            proc.stdin.write(
+                f"refresh-client -B '{SUBSCRIPTION_NAME}::{SUBSCRIPTION_FORMAT}'\n{STATUS_COMMAND}\n".encode()
+            )
+            await proc.stdin.drain()
+            if await _read_notifications(proc, on_statuses):
+                retry_delay = RETRY_DELAY_SECONDS
+        except (OSError, ValueError):
+            pass
+        finally:
+            on_disconnect()
+            if proc.returncode is None:
+                proc.kill()
+            await proc.wait()
+
+        await asyncio.sleep(retry_delay)
+        retry_delay = min(retry_delay * 2, MAX_RETRY_DELAY_SECONDS)
+
+
+async def _read_notifications(proc: asyncio.subprocess.Process, on_statuses: Callable[[str], None]) -> bool:
+    """Read control-mode output until the client exits. Returns True if statuses were received."""
+    received = False
+    block: list[str] | None = None
+    while line := await proc.stdout.readline():
+        line = line.decode(errors="replace").rstrip("\n")
+        if block is not None:
+            if line.startswith("%end "):
+                # Attach and refresh-client reply with empty blocks, only list-windows has output
+                if block:
+                    on_statuses("\n".join(block))
+                    received = True
+                block = None
+            elif line.startswith("%error "):
+                block = None
+            else:
+                block.append(line)
+        elif line.startswith("%begin "):
+            block = []
+        elif line.startswith(f"%subscription-changed {SUBSCRIPTION_NAME} "):
+            proc.stdin.write(f"{STATUS_COMMAND}\n".encode())
+            await proc.stdin.drain()
+        elif line.startswith("%exit"):
+            break
+    return received
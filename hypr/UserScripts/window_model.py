@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+In-memory index of Hyprland clients, kept up to date from socket2 events.
+Clients are stored as the same records get_clients decodes from `hyprctl clients -j`,
+so the index can stand in for a full clients dump between resyncs.
+"""
+
+import threading
+import time
+from dataclasses import replace
+
+from records import Client, Workspace
+
+
+class ClientIndex:
+    """Clients keyed by address, plus the active workspace."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clients: dict[str, Client] = {}
+        self.active_workspace_id: int | None = None
+        self.workspace_ids: dict[str, int] = {}
+        self.needs_resync = True
+        self.synced_at = 0.0
+
+    def resync(self, clients: list[Client], active_workspace: Workspace) -> None:
+        """Replace the index with a full clients dump."""
+        fresh = {client.address: client for client in clients if client.address}
+        with self._lock:
+            self.clients = fresh
+            for client in fresh.values():
+                if client.workspace_id is not None and client.workspace_name:
+                    self.workspace_ids[client.workspace_name] = client.workspace_id
+            self.active_workspace_id = active_workspace.id
+            self.needs_resync = False
+            self.synced_at = time.monotonic()
+
+    def apply(self, event: str, data: str) -> bool:
+        """Apply a socket2 event to the index. Returns True if the model changed."""
+        handler = _EVENT_HANDLERS.get(event)
+        if handler is None:
+            return False
+        with self._lock:
+            return handler(self, data)
+
+    def view(self) -> tuple[list[Client], int | None]:
+        """Return (clients, active workspace id).
+
+        Client records are replaced rather than mutated on update, so the returned
+        list is safe to read from another thread while events keep arriving.
+        """
+        with self._lock:
+            return list(self.clients.values()), self.active_workspace_id
+
+    def stale(self, max_age: float) -> bool:
+        return self.needs_resync or time.monotonic() - self.synced_at > max_age
+
+    def _resolve_workspace(self, name: str) -> int | None:
+        ws_id = self.workspace_ids.get(name)
+        if ws_id is None and name.lstrip("-").isdigit():
+            ws_id = int(name)
+        if ws_id is None:
+            # Unknown named workspace, let the next full resync place the client
+            self.needs_resync = True
+        return ws_id
+
+    def _on_openwindow(self, data: str) -> bool:
+        # openwindow>>ADDRESS,WORKSPACENAME,WINDOWCLASS,WINDOWTITLE
+        parts = data.split(",", 3)
+        if len(parts) != 4:
+            return False
+        address, ws_name, cls, title = parts
+        client = Client(_address(address), cls, title, self._resolve_workspace(ws_name), ws_name)
+        self.clients[client.address] = client
+        return True
+
+    def _on_closewindow(self, data: str) -> bool:
+        # closewindow>>ADDRESS
+        return self.clients.pop(_address(data), None) is not None
+
+    def _on_movewindowv2(self, data: str) -> bool:
+        # movewindowv2>>ADDRESS,WORKSPACEID,WORKSPACENAME
+        parts = data.split(",", 2)
+        if len(parts) != 3 or not parts[1].lstrip("-").isdigit():
+            return False
+        address, ws_id, ws_name = _address(parts[0]), int(parts[1]), parts[2]
+        self.workspace_ids[ws_name] = ws_id
+        old = self.clients.get(address)
+        if old is None:
+            self.needs_resync = True
+            return False
+        if old.workspace_id == ws_id:
+            return False
+        self.clients[address] = replace(old, workspace_id=ws_id, workspace_name=ws_name)
+        return True
+
+    def _on_windowtitlev2(self, data: str) -> bool:
+        # windowtitlev2>>ADDRESS,TITLE
+        address, _, title = data.partition(",")
+        address = _address(address)
+        old = self.clients.get(address)
+        if old is None or old.title == title:
+            return False
+        self.clients[address] = replace(old, title=title)
+        return True
+
+    def _on_workspacev2(self, data: str) -> bool:
+        # workspacev2>>WORKSPACEID,WORKSPACENAME
+        ws_id, _, ws_name = data.partition(",")
+        if not ws_id.lstrip("-").isdigit():
+            return False
+        self.workspace_ids[ws_name] = int(ws_id)
+        changed = self.active_workspace_id != int(ws_id)
+        self.active_workspace_id = int(ws_id)
+        return changed
+
+    def _on_activespecial(self, data: str) -> bool:
+        # activespecial>>WORKSPACENAME,MONNAME (empty name when the special workspace closes)
+        # The regular active workspace is unchanged, but focus moved, so the names may need a refresh
+        return True
+
+
+_EVENT_HANDLERS = {
+    "openwindow": ClientIndex._on_openwindow,
+    "closewindow": ClientIndex._on_closewindow,
+    "movewindowv2": ClientIndex._on_movewindowv2,
+    "windowtitlev2": ClientIndex._on_windowtitlev2,
+    "workspacev2": ClientIndex._on_workspacev2,
+    "activespecial": ClientIndex._on_activespecial,
+}
+
+MODEL_EVENTS = set(_EVENT_HANDLERS)
+
+
+def _address(address: str) -> str:
+    """socket2 events omit the 0x prefix that `clients -j` uses."""
+    return address if address.startswith("0x") else f"0x{address}"